@@ -0,0 +1,57 @@
+"""Compare retained memory of parsed configs and their frozen counterparts
+
+Usage: python benchmarks/bench_frozen.py [--keys N] [--depth N] [--list-length N]
+"""
+import gc
+import os
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+import yamlconfig
+from yamlconfig.frozen import freeze
+
+import synthetic
+
+
+def retained(func, *args):
+    """Bytes still allocated by result of func"""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, default=8)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--list-length', type=int, default=20)
+    args = parser.parse_args()
+
+    config = synthetic.make_config(args.keys, args.depth, args.list_length)
+    tmpdir = tempfile.mkdtemp(prefix='yamlconfig-bench-')
+    try:
+        path = synthetic.write_yaml(config, os.path.join(tmpdir, 'config.yaml'))
+        _, round_trip_size = retained(yamlconfig.plain_parse_yaml, path, True)
+        _, plain_size = retained(yamlconfig.plain_parse_yaml, path)
+        # parsed tree is freed, only the frozen config is retained
+        _, frozen_size = retained(
+                lambda: freeze(yamlconfig.plain_parse_yaml(path, round_trip=True)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    for name, size in [
+            ('round-trip', round_trip_size),
+            ('safe', plain_size),
+            ('frozen', frozen_size)]:
+        print('{:<12} {:>10.2f} MiB {:>8.1f}x'.format(
+            name, size / 2 ** 20, round_trip_size / size))
+
+
+if __name__ == '__main__':
+    main()
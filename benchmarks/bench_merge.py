@@ -0,0 +1,56 @@
+"""Compare merge_multiple against the former deepcopy-based merge
+
+Usage: python benchmarks/bench_merge.py [--keys N] [--depth N] [--list-length N] [--layers N]
+"""
+import gc
+import copy
+import time
+import argparse
+import tracemalloc
+
+import yamlconfig
+
+from synthetic import make_config
+from synthetic import make_overlay
+
+
+def merge_deepcopy(configdicts):
+    """Former merge_multiple implementation"""
+    cfd = None
+    for newcfd in configdicts:
+        if cfd is None:
+            cfd = copy.deepcopy(newcfd)
+        else:
+            yamlconfig.update_recursive_plain(cfd, newcfd)
+    return cfd
+
+
+def measure(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--list-length', type=int, default=100)
+    parser.add_argument('--layers', type=int, default=4)
+    args = parser.parse_args()
+
+    base = make_config(args.keys, args.depth, args.list_length)
+    layers = [base] + [make_overlay(base, every=n + 2) for n in range(args.layers - 1)]
+
+    for name, func in [('deepcopy', merge_deepcopy), ('merge_multiple', yamlconfig.merge_multiple)]:
+        elapsed, peak = measure(func, layers)
+        print('{:<16} {:>10.4f} s {:>10.2f} MiB peak'.format(name, elapsed, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Compare compiled Schema validation against hand-written nested checks
+
+Usage: python benchmarks/bench_schema.py [--keys N] [--depth N] [--repeat N]
+"""
+import copy
+import time
+import argparse
+
+from yamlconfig.schema import Schema, Field, SchemaError
+
+from synthetic import make_config
+
+
+def make_spec(config):
+    """Schema spec for synthetic config"""
+    spec = {}
+    for key, value in config.items():
+        if isinstance(value, dict):
+            spec[key] = make_spec(value)
+        elif key.endswith('_file'):
+            spec[key] = Field(str, path=True)
+        else:
+            spec[key] = type(value)
+    spec['optional'] = Field(int, default=0)
+    return spec
+
+
+def check_by_hand(config, rootdir=None):
+    """Nested checks as written in the tools using yamlconfig"""
+    errors = []
+
+    def check(section, prefix):
+        if 'optional' not in section:
+            section['optional'] = 0
+        for key in list(section):
+            value = section[key]
+            if isinstance(value, dict):
+                check(value, prefix + key + '.')
+            elif key.endswith('_file'):
+                if not isinstance(value, str):
+                    errors.append(prefix + key)
+                elif rootdir is not None:
+                    section[key] = rootdir + '/' + value
+            elif key == 'values':
+                if not isinstance(value, list):
+                    errors.append(prefix + key)
+            elif key != 'optional' and not isinstance(value, int):
+                errors.append(prefix + key)
+
+    check(config, '')
+    if errors:
+        raise SchemaError(errors)
+    return config
+
+
+def best_of(func, configs):
+    best = None
+    for config in configs:
+        start = time.perf_counter()
+        func(config)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    config = make_config(args.keys, args.depth, list_length=10)
+    spec = make_spec(config)
+
+    start = time.perf_counter()
+    schema = Schema(spec)
+    compile_time = time.perf_counter() - start
+
+    results = [
+        ('hand-written', best_of(
+            check_by_hand, [copy.deepcopy(config) for _ in range(args.repeat)])),
+        ('Schema', best_of(
+            schema.validate, [copy.deepcopy(config) for _ in range(args.repeat)]))]
+
+    print('compile {:>10.2f} ms'.format(compile_time * 1e3))
+    for name, elapsed in results:
+        print('{:<14} {:>10.2f} ms'.format(name, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main()
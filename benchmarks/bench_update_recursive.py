@@ -0,0 +1,111 @@
+"""Compare update_recursive against the former recursive implementation
+
+Usage: python benchmarks/bench_update_recursive.py [--keys N] [--depth N] [--chain-depth N] [--repeat N]
+"""
+import gc
+import sys
+import copy
+import time
+import argparse
+import functools
+
+import yamlconfig
+from yamlconfig.parse import _dict_types
+
+from synthetic import make_config
+from synthetic import make_overlay
+
+
+def update_recursive_former(template, subset,
+        ignore_notintemplate=True, delete_notinsubset=False):
+    """Former recursive update_recursive implementation"""
+    if not isinstance(template, _dict_types) or not isinstance(subset, _dict_types):
+        return subset
+
+    for key in subset:
+        if key not in template and ignore_notintemplate:
+            continue
+        elif key in template and isinstance(template[key], _dict_types):
+            update_recursive_former(
+                    template=template[key],
+                    subset=subset[key],
+                    ignore_notintemplate=ignore_notintemplate,
+                    delete_notinsubset=delete_notinsubset)
+        else:
+            template[key] = subset[key]
+    if delete_notinsubset:
+        delete_keys_recursive_former(superset=template, subset=subset)
+
+
+def delete_keys_recursive_former(superset, subset):
+    for key in list(superset):
+        if key not in subset:
+            del superset[key]
+        elif isinstance(superset[key], _dict_types):
+            delete_keys_recursive_former(superset[key], subset[key])
+
+
+def make_chain(depth, leaf):
+    root = node = {}
+    for _ in range(depth):
+        node['child'] = {'value': 0}
+        node = node['child']
+    node.update(leaf)
+    return root
+
+
+def timed(func, template, subset, repeat, **kwargs):
+    """Minimum time of repeat runs, each on a fresh copy of template
+
+    None if func hits the recursion limit
+    """
+    best = None
+    for _ in range(repeat):
+        target = copy.deepcopy(template)
+        # like timeit, keep garbage collection out of the timing
+        gc.disable()
+        start = time.perf_counter()
+        try:
+            func(target, subset, **kwargs)
+        except RecursionError:
+            return None
+        finally:
+            elapsed = time.perf_counter() - start
+            gc.enable()
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--chain-depth', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), args.chain_depth * 3))
+
+    wide = make_config(args.keys, args.depth, list_length=1)
+    cases = [
+        ('wide', wide, make_overlay(wide, every=2)),
+        ('deep', make_chain(args.chain_depth, {'a': 1}), make_chain(args.chain_depth, {'a': 2}))]
+    impls = [
+        ('former', update_recursive_former),
+        ('current', yamlconfig.update_recursive),
+        ('paths', functools.partial(yamlconfig.update_recursive, key_paths=True))]
+
+    print('minimum of {} runs'.format(args.repeat))
+    for name, template, subset in cases:
+        for delete in [False, True]:
+            for impl, func in impls:
+                elapsed = timed(
+                        func, template, subset, args.repeat,
+                        ignore_notintemplate=False, delete_notinsubset=delete)
+                result = 'recursion error' if elapsed is None else '{:.4f} s'.format(elapsed)
+                print('{:<5} delete={!s:<5} {:<8} {:>12}'.format(name, delete, impl, result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""Benchmark yamlconfig hot paths on synthetic configs
+
+Usage:
+    python benchmarks/run.py [options] --output results.json
+    python benchmarks/run.py [options] --compare baseline.json
+"""
+import gc
+import os
+import sys
+import copy
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+import yamlconfig
+from yamlconfig import rootdir_logic
+
+import synthetic
+
+
+def make_cases(args, tmpdir):
+    """Get benchmark cases as (name, setup, func)
+
+    setup() returns the arguments for func and is not timed
+    """
+    config = synthetic.make_config(
+            keys=args.keys, depth=args.depth, list_length=args.list_length,
+            path_keys=args.path_keys)
+    layers = [config] + [
+        synthetic.make_overlay(config, every=n + 2) for n in range(args.layers - 1)]
+
+    plain_file = synthetic.write_yaml(config, os.path.join(tmpdir, 'plain.yaml'))
+    treedir = os.path.join(tmpdir, 'tree')
+    os.mkdir(treedir)
+    tree_file = synthetic.write_config_tree(
+            treedir, config, fanout=args.fanout, link_depth=args.link_depth)
+    save_file = os.path.join(tmpdir, 'saved.yaml')
+
+    rooted = dict(config, rootdir=tmpdir)
+    joined = rootdir_logic.join_paths_with_rootdir(
+            copy.deepcopy(rooted), default_rootdir=tmpdir)
+
+    return [
+        ('plain_parse_yaml',
+            lambda: (plain_file,),
+            yamlconfig.plain_parse_yaml),
+        ('parse_config_file',
+            lambda: (tree_file,),
+            lambda path: yamlconfig.parse_config_file(path, join_rootdir=True)),
+        ('parse_lazy_one_section',
+            lambda: (plain_file,),
+            lambda path: _access_first(yamlconfig.parse_config_file(path, lazy=True))),
+        ('merge_multiple',
+            lambda: (layers,),
+            yamlconfig.merge_multiple),
+        ('update_recursive',
+            lambda: (copy.deepcopy(config), layers[-1]),
+            yamlconfig.update_recursive_plain),
+        ('join_paths_with_rootdir',
+            lambda: (copy.deepcopy(rooted),),
+            lambda configdict: rootdir_logic.join_paths_with_rootdir(
+                configdict, default_rootdir=tmpdir)),
+        ('remove_rootdir_from_paths',
+            lambda: (copy.deepcopy(joined),),
+            rootdir_logic.remove_rootdir_from_paths),
+        ('save_to_yaml',
+            lambda: (copy.deepcopy(config), save_file),
+            lambda configdict, path: yamlconfig.save_to_yaml(
+                configdict, path, round_trip=False, default_flow_style=False)),
+        ('save_to_yaml_stream',
+            lambda: (joined, save_file),
+            lambda configdict, path: yamlconfig.save_to_yaml(
+                configdict, path, round_trip=False, default_flow_style=False, stream=True)),
+    ]
+
+
+def _access_first(config):
+    next(iter(config.values()))
+    return config
+
+
+def run_case(setup, func, repeat):
+    times = []
+    for _ in range(repeat):
+        fargs = setup()
+        gc.collect()
+        start = time.perf_counter()
+        func(*fargs)
+        times.append(time.perf_counter() - start)
+
+    fargs = setup()
+    gc.collect()
+    tracemalloc.start()
+    result = func(*fargs)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    times.sort()
+    return dict(
+            min_s=times[0],
+            median_s=times[len(times) // 2],
+            peak_bytes=peak,
+            retained_bytes=retained)
+
+
+def compare(results, baseline):
+    base = {r['name']: r for r in baseline['results']}
+    print('{:<28} {:>12} {:>12} {:>8} {:>8}'.format(
+        'benchmark', 'baseline s', 'current s', 'time', 'memory'))
+    for r in results['results']:
+        b = base.get(r['name'])
+        if b is None:
+            continue
+        print('{:<28} {:>12.5f} {:>12.5f} {:>7.2f}x {:>7.2f}x'.format(
+            r['name'], b['min_s'], r['min_s'],
+            r['min_s'] / b['min_s'],
+            r['peak_bytes'] / max(b['peak_bytes'], 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keys', type=int, default=8, help='sections per level')
+    parser.add_argument('--depth', type=int, default=3, help='nesting depth')
+    parser.add_argument('--list-length', type=int, default=20, help='list length per leaf')
+    parser.add_argument('--path-keys', type=int, default=2, help='path-like keys per level')
+    parser.add_argument('--fanout', type=int, default=2, help='linked files per file')
+    parser.add_argument('--link-depth', type=int, default=2, help='depth of linked files tree')
+    parser.add_argument('--layers', type=int, default=4, help='configs to merge')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--filter', help='only run benchmarks containing this string')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--compare', help='compare with JSON results from this file')
+    args = parser.parse_args()
+
+    params = {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'filter')}
+    results = dict(
+            meta=dict(
+                yamlconfig=yamlconfig.__version__,
+                python=platform.python_version(),
+                platform=platform.platform(),
+                c_backend=yamlconfig.has_c_backend()),
+            params=params,
+            results=[])
+
+    tmpdir = tempfile.mkdtemp(prefix='yamlconfig-bench-')
+    try:
+        for name, setup, func in make_cases(args, tmpdir):
+            if args.filter and args.filter not in name:
+                continue
+            result = run_case(setup, func, args.repeat)
+            result['name'] = name
+            results['results'].append(result)
+            sys.stderr.write('{:<28} {:>10.5f} s {:>10.2f} MiB peak {:>10.2f} MiB retained\n'.format(
+                name, result['min_s'], result['peak_bytes'] / 2 ** 20,
+                result['retained_bytes'] / 2 ** 20))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    if args.output:
+        with open(args.output, 'w') as fout:
+            json.dump(results, fout, indent=2, sort_keys=True)
+    elif not args.compare:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+    if args.compare:
+        with open(args.compare) as fin:
+            compare(results, json.load(fin))
+
+
+if __name__ == '__main__':
+    main()
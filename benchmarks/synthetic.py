@@ -0,0 +1,102 @@
+"""Synthetic config generation for benchmarks"""
+import os
+
+import ruamel.yaml
+
+
+def make_config(keys=10, depth=3, list_length=10, path_keys=2, seed=0):
+    """Generate nested config dict
+
+    Parameters
+    ----------
+    keys : int
+        number of sections per level and scalar values per leaf
+    depth : int
+        nesting depth
+    list_length : int
+        length of the list in every leaf
+    path_keys : int
+        number of path-like keys per level
+    seed : int
+        offset for generated values
+
+    Returns
+    -------
+    dict
+        config dict
+    """
+    config = {}
+    for i in range(path_keys):
+        config['input{}_file'.format(i)] = 'data/{}/file{}.tif'.format(seed, i)
+    if depth == 0:
+        for i in range(keys):
+            config['value{}'.format(i)] = seed + i
+        config['values'] = list(range(seed, seed + list_length))
+        return config
+    for i in range(keys):
+        config['section{}'.format(i)] = make_config(
+                keys, depth - 1, list_length, path_keys, seed)
+    return config
+
+
+def make_overlay(config, every, value='overridden'):
+    """Overlay changing every n-th leaf value of config"""
+    overlay = {}
+    for i, key in enumerate(config):
+        item = config[key]
+        if isinstance(item, dict):
+            overlay[key] = make_overlay(item, every, value)
+        elif i % every == 0:
+            overlay[key] = value
+    return overlay
+
+
+def count_keys(config):
+    """Total number of keys at all levels"""
+    return sum(
+        1 + (count_keys(value) if isinstance(value, dict) else 0)
+        for value in config.values())
+
+
+def write_yaml(config, path):
+    with open(path, 'w') as fout:
+        ruamel.yaml.safe_dump(config, fout, default_flow_style=False)
+    return path
+
+
+def write_config_tree(outdir, config, fanout=2, link_depth=2):
+    """Write config file with tree of linked config files
+
+    Each file links `fanout` other files down to `link_depth` levels.
+    Linked files hold overlays of config, the root file holds config.
+
+    Parameters
+    ----------
+    outdir : str
+        output directory
+    config : dict
+        root config dict
+    fanout : int
+        number of linked files per file
+    link_depth : int
+        depth of the include tree
+
+    Returns
+    -------
+    str
+        path to root config file
+    """
+    counter = [0]
+
+    def write(content, level):
+        name = 'config{}.yaml'.format(counter[0])
+        counter[0] += 1
+        content = dict(content)
+        if level < link_depth:
+            content['config_files'] = [
+                write(make_overlay(config, every=level + 2, value=counter[0]), level + 1)
+                for _ in range(fanout)]
+        write_yaml(content, os.path.join(outdir, name))
+        return name
+
+    return os.path.join(outdir, write(config, 0))
@@ -7,4 +7,4 @@ setup(
     author='Jonas Solvsteen',
     author_email='josl@dhi-gras.com',
     packages=find_packages(),
-    install_requires=['ruamel.yaml', 'click'])
+    install_requires=['ruamel.yaml', 'click', 'futures; python_version < "3"'])
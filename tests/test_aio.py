@@ -0,0 +1,94 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+import yamlconfig
+from yamlconfig import aio
+
+import testdata
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _slow_load_layer(monkeypatch, delay=0.05):
+    """Patch aio._load_layer to sleep and record the peak number of parallel loads"""
+    lock = threading.Lock()
+    state = dict(running=0, peak=0, loaded=[])
+    load_layer = aio._load_layer
+
+    def slow_load_layer(path, **kwargs):
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+        try:
+            time.sleep(delay)
+            return load_layer(path, **kwargs)
+        finally:
+            with lock:
+                state['running'] -= 1
+                state['loaded'].append(path)
+
+    monkeypatch.setattr(aio, '_load_layer', slow_load_layer)
+    return state
+
+
+@pytest.mark.parametrize('name', ['merge_linked_linking', 'linked_diamond_top'])
+def test_parse_config_file_async(name):
+    testfiles = testdata.get_data_files()
+    expected = yamlconfig.parse_config_file(testfiles[name], join_rootdir=True)
+    result = _run(aio.parse_config_file_async(testfiles[name], join_rootdir=True))
+    assert result == expected
+
+
+def test_parse_async_loads_linked_concurrently(monkeypatch):
+    testfiles = testdata.get_data_files()
+    state = _slow_load_layer(monkeypatch)
+    _run(aio.parse_config_file_async(testfiles['linked_diamond_top']))
+    # left and right are loaded at the same time, base only once
+    assert state['peak'] == 2
+    assert len(state['loaded']) == 4
+
+
+def test_parse_async_max_concurrency(monkeypatch):
+    testfiles = testdata.get_data_files()
+    state = _slow_load_layer(monkeypatch)
+    _run(aio.parse_merge_multiple_async(
+        [testfiles['linked_diamond_top'], testfiles['merge_linked_linking']],
+        max_concurrency=1))
+    assert state['peak'] == 1
+
+
+def test_parse_async_cycle():
+    testfiles = testdata.get_data_files()
+    with pytest.raises(yamlconfig.parse.LinkedConfigCycleError):
+        _run(aio.parse_config_file_async(testfiles['linked_cycle_a']))
+
+
+def test_parse_async_cancel(monkeypatch):
+    testfiles = testdata.get_data_files()
+    state = _slow_load_layer(monkeypatch, delay=0.2)
+    loop = asyncio.new_event_loop()
+    try:
+        task = loop.create_task(aio.parse_config_file_async(testfiles['linked_diamond_top']))
+        loop.call_later(0.05, task.cancel)
+        with pytest.raises(asyncio.CancelledError):
+            loop.run_until_complete(task)
+    finally:
+        loop.close()
+    # linked files were never scheduled
+    assert len(state['loaded']) <= 1
+
+
+def test_parse_merge_multiple_async():
+    testfiles = testdata.get_data_files()
+    files = [testfiles['merge_multi1'], testfiles['merge_multi2']]
+    expected = yamlconfig.parse_merge_multiple(files)
+    assert _run(aio.parse_merge_multiple_async(files)) == expected
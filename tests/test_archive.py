@@ -0,0 +1,110 @@
+import os
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+import yamlconfig
+from yamlconfig.archive import ConfigArchive, ArchiveSource, parse_archive
+from yamlconfig.trace import Tracer
+
+import testdata
+
+_LINKED = [
+    'merge_linked_linking.yaml',
+    'merge_linked_linked1.yaml',
+    'merge_linked_linked2.yaml']
+
+
+def _make_archive(tmpdir, kind, prefix='bundle/'):
+    datadir = os.path.dirname(testdata.get_data_files()['merge_linked_linking'])
+    if kind == 'zip':
+        path = str(tmpdir.join('bundle.zip'))
+        with zipfile.ZipFile(path, 'w') as zf:
+            for name in _LINKED:
+                zf.write(os.path.join(datadir, name), prefix + name)
+    else:
+        path = str(tmpdir.join('bundle.tar.gz'))
+        with tarfile.open(path, 'w:gz') as tf:
+            for name in _LINKED:
+                tf.add(os.path.join(datadir, name), prefix + name)
+    return path
+
+
+@pytest.mark.parametrize('kind', ['zip', 'tar'])
+def test_parse_archive_linked(tmpdir, kind):
+    infile = testdata.get_data_files()['merge_linked_linking']
+    expected = yamlconfig.parse_config_file(infile)
+    path = _make_archive(tmpdir, kind)
+
+    archive = ConfigArchive(path)
+    assert sorted(archive.members) == sorted('bundle/' + name for name in _LINKED)
+    source = archive.source('bundle/merge_linked_linking.yaml')
+    assert source.basedir == os.path.join(str(tmpdir), 'bundle')
+
+    assert yamlconfig.parse_config_file(source) == expected
+    assert yamlconfig.parse_config_file(source, lazy=True).materialize() == expected
+
+
+def test_linked_files_not_reopened(tmpdir, monkeypatch):
+    path = _make_archive(tmpdir, 'zip')
+    archive = ConfigArchive(path)
+    monkeypatch.setattr(zipfile, 'ZipFile', None)
+    config = yamlconfig.parse_config_file(archive.source('bundle/merge_linked_linking.yaml'))
+    assert config['foo'] == 'linkingvalue'
+
+
+def test_parse_archive_traced(tmpdir):
+    path = _make_archive(tmpdir, 'zip', prefix='')
+    with Tracer() as tracer:
+        config = parse_archive(path, member='merge_linked_linking.yaml')
+    assert config['foo'] == 'linkingvalue'
+    reads = [rec for rec in tracer.records if rec.phase == 'read']
+    assert reads
+    assert all(rec.nbytes > 0 for rec in reads)
+
+
+def test_rootdir_relative_to_member(tmpdir):
+    path = str(tmpdir.join('bundle.zip'))
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('main.yaml', 'config_files: [sub/linked.yaml]\nin_file: data/x.tif\n')
+        zf.writestr('sub/linked.yaml', 'config_files: [../outside.yaml]\nvalue: 1\n')
+    tmpdir.join('outside.yaml').write('value: 2\nother: 3\n')
+
+    root = str(tmpdir.join('extracted'))
+    # outside.yaml is not in the archive and not under root on disk
+    with pytest.raises(IOError):
+        parse_archive(path, root=root)
+    config = parse_archive(path, root=root, join_rootdir=True, merge_linked_files=False)
+    assert config['in_file'] == os.path.join(root, 'data', 'x.tif')
+
+    # default root is the archive's directory, where outside.yaml is
+    config = parse_archive(path)
+    assert config == {'in_file': 'data/x.tif', 'value': 1, 'other': 3}
+
+
+def test_source_errors(tmpdir):
+    path = _make_archive(tmpdir, 'zip', prefix='')
+    archive = ConfigArchive(path)
+    with pytest.raises(ValueError):
+        archive.source()
+    with pytest.raises(KeyError):
+        archive.source('missing.yaml')
+    assert isinstance(archive.source('./merge_linked_linked1.yaml'), ArchiveSource)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason='requires async def')
+def test_archive_async(tmpdir):
+    import asyncio
+    from yamlconfig import aio
+    infile = testdata.get_data_files()['merge_linked_linking']
+    expected = yamlconfig.parse_config_file(infile)
+    archive = ConfigArchive(_make_archive(tmpdir, 'tar'))
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(aio.parse_config_file_async(
+            archive.source('bundle/merge_linked_linking.yaml')))
+    finally:
+        loop.close()
+    assert result == expected
@@ -0,0 +1,59 @@
+import pytest
+
+import yamlconfig
+
+import testdata
+
+requires_c = pytest.mark.skipif(
+    not yamlconfig.has_c_backend(),
+    reason='ruamel.yaml built without libyaml')
+
+backends = ['pure', 'auto', pytest.param('c', marks=requires_c)]
+
+
+def _same_types(a, b):
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return all(_same_types(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return all(_same_types(x, y) for x, y in zip(a, b))
+    return True
+
+
+@pytest.mark.parametrize('backend', backends)
+def test_parse_equivalent(backend):
+    for name, path in sorted(testdata.get_data_files().items()):
+        expected = yamlconfig.plain_parse_yaml(path, backend='pure')
+        result = yamlconfig.plain_parse_yaml(path, backend=backend)
+        assert result == expected, name
+        assert _same_types(result, expected), name
+
+
+@pytest.mark.parametrize('backend', backends)
+def test_save_equivalent(backend, tmpdir):
+    testfiles = testdata.get_data_files()
+    config = yamlconfig.plain_parse_yaml(testfiles['nested_multi_template'])
+    config['values'] = [1, 2.5, None, True, 'text']
+
+    expected_file = str(tmpdir.join('expected.yaml'))
+    result_file = str(tmpdir.join('result.yaml'))
+    yamlconfig.save_to_yaml(config, expected_file, round_trip=False, backend='pure')
+    yamlconfig.save_to_yaml(config, result_file, round_trip=False, backend=backend)
+
+    assert (
+        yamlconfig.plain_parse_yaml(result_file) ==
+        yamlconfig.plain_parse_yaml(expected_file))
+
+
+def test_invalid_backend():
+    testfiles = testdata.get_data_files()
+    with pytest.raises(ValueError):
+        yamlconfig.plain_parse_yaml(testfiles['hello'], backend='fast')
+
+
+@pytest.mark.skipif(yamlconfig.has_c_backend(), reason='ruamel.yaml built with libyaml')
+def test_c_backend_unavailable():
+    testfiles = testdata.get_data_files()
+    with pytest.raises(ValueError):
+        yamlconfig.plain_parse_yaml(testfiles['hello'], backend='c')
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+import yamlconfig
+from yamlconfig.cache import ParseCache
+from yamlconfig.source import FileSource
+
+import testdata
+
+
+def test_cache_hit_returns_copy(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    testdata.write_file(configfile, 'foo:\n  bar: 1\n')
+    cache = ParseCache(maxsize=2)
+
+    first = yamlconfig.parse_config_file(str(configfile), cache=cache)
+    first['foo']['bar'] = 2
+    second = yamlconfig.parse_config_file(str(configfile), cache=cache)
+
+    assert second['foo']['bar'] == 1
+    info = cache.info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_cache_invalidated_by_linked_file(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS, mtime=1000)
+    linked = tmpdir.join('linked.yaml')
+    cache = ParseCache()
+
+    config = yamlconfig.parse_config_file(configfile, cache=cache)
+    assert config['bar'] == 'linked'
+
+    testdata.write_file(linked, 'bar: changed\n', mtime=2000)
+    config = yamlconfig.parse_config_file(configfile, cache=cache)
+    assert config['bar'] == 'changed'
+    assert cache.info().misses == 2
+
+
+def test_cache_options_in_key(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    testdata.write_file(configfile, 'some_dir: foo\n')
+    cache = ParseCache()
+
+    plain = yamlconfig.parse_config_file(str(configfile), cache=cache)
+    joined = yamlconfig.parse_config_file(str(configfile), join_rootdir=True, cache=cache)
+
+    assert plain['some_dir'] == 'foo'
+    assert joined['some_dir'] == os.path.join(str(tmpdir), 'foo')
+    assert cache.info().hits == 0
+
+
+def test_cache_basedir_in_key(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    testdata.write_file(configfile, 'in_file: x.tif\n')
+    cache = ParseCache()
+    for basedir in ['/one', '/two']:
+        result = yamlconfig.parse_config_file(
+                str(configfile), join_rootdir=True, basedir=basedir, cache=cache)
+        assert result['in_file'] == os.path.join(basedir, 'x.tif')
+    assert cache.info().hits == 0
+
+
+def test_cache_file_source(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    testdata.write_file(configfile, 'foo: 1\n')
+    cache = ParseCache()
+    yamlconfig.parse_config_file(str(configfile), cache=cache)
+    result = yamlconfig.parse_config_file(FileSource(str(configfile)), cache=cache)
+    assert result == {'foo': 1}
+    assert cache.info().hits == 1
+
+
+def test_cache_eviction_and_clear(tmpdir):
+    cache = ParseCache(maxsize=2)
+    for name in 'abc':
+        configfile = tmpdir.join(name + '.yaml')
+        testdata.write_file(configfile, 'name: {}\n'.format(name))
+        yamlconfig.parse_config_file(str(configfile), cache=cache)
+
+    info = cache.info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 0, 2)
+
+
+def test_cache_maxsize_invalid():
+    with pytest.raises(ValueError):
+        ParseCache(maxsize=0)
+
+
+def test_cache_file_changed_while_parsing(tmpdir, monkeypatch):
+    from yamlconfig import parse
+    configfile = tmpdir.join('config.yaml')
+    testdata.write_file(configfile, 'foo: old\n', mtime=1000)
+    load_layer = parse._load_layer
+
+    def load_then_rewrite(*args, **kwargs):
+        result = load_layer(*args, **kwargs)
+        testdata.write_file(configfile, 'foo: newer\n', mtime=2000)
+        return result
+
+    monkeypatch.setattr(parse, '_load_layer', load_then_rewrite)
+    cache = ParseCache()
+    assert yamlconfig.parse_config_file(str(configfile), cache=cache)['foo'] == 'old'
+    monkeypatch.setattr(parse, '_load_layer', load_layer)
+    assert yamlconfig.parse_config_file(str(configfile), cache=cache)['foo'] == 'newer'
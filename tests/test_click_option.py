@@ -88,3 +88,70 @@ def test_keys_with_defaults():
     result = runner.invoke(main, inp, catch_exceptions=False)
     assert result.exit_code == 0
     assert result.output == 'hello tough guy\n'
+
+
+def test_deferred_not_parsed_unless_accessed(monkeypatch):
+    from yamlconfig import click_type
+    testfiles = testdata.get_data_files()
+    inp = ['-c', testfiles['hello'], '-c', testfiles['world']]
+
+    parsed = []
+    parse_config_file = click_type.parse_config_file
+
+    def counting_parse(path, **kwargs):
+        parsed.append(path)
+        return parse_config_file(path, **kwargs)
+
+    monkeypatch.setattr(click_type, 'parse_config_file', counting_parse)
+
+    @click.command()
+    @click.option('--dry-run', is_flag=True)
+    @yaml_config_option(keys=['name', 'greeting'], deferred=True)
+    def main(config, dry_run):
+        if dry_run:
+            click.echo('dry run')
+            return
+        click.echo('{greeting} {name}'.format(**config))
+
+    runner = CliRunner()
+    result = runner.invoke(main, inp + ['--dry-run'], catch_exceptions=False)
+    assert result.output == 'dry run\n'
+    assert parsed == []
+
+    result = runner.invoke(main, inp, catch_exceptions=False)
+    assert result.output == 'hello world\n'
+    assert len(parsed) == 2
+
+
+def test_deferred_errors(tmpdir):
+    @click.command()
+    @yaml_config_option(deferred=True, multiple=False)
+    def main(config):
+        click.echo(len(config))
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['-c', str(tmpdir.join('missing.yaml'))])
+    assert result.exit_code == 2
+    assert 'does not exist' in result.output
+
+    broken = tmpdir.join('broken.yaml')
+    broken.write('name: [unclosed\n')
+    result = runner.invoke(main, ['-c', str(broken)])
+    assert result.exit_code == 2
+    assert 'Unable to parse YAML' in result.output
+
+
+def test_dotted_keys(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write('processing:\n  bands:\n    red: {scale: 2}\ndotted.key: 1\n')
+
+    @click.command()
+    @yaml_config_option(
+            keys=['processing.bands.red.scale', 'dotted.key', ('processing.offset', 0)])
+    def main(**kwargs):
+        click.echo(sorted(kwargs.items()))
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['-c', str(configfile)], catch_exceptions=False)
+    assert result.output == str([
+        ('dotted.key', 1), ('processing_bands_red_scale', 2), ('processing_offset', 0)]) + '\n'
@@ -0,0 +1,109 @@
+import copy
+
+import pytest
+
+import yamlconfig
+from yamlconfig.diff import diff_configs, make_overlay
+from yamlconfig.fingerprint import ConfigFingerprint
+
+import testdata
+
+
+def _base():
+    return {
+        'name': 'base',
+        'section': {'a': 1, 'b': [1, 2], 'nested': {'c': 'x'}},
+        'scalar': 1,
+        'unchanged': {'big': list(range(100))}}
+
+
+def _target():
+    target = _base()
+    target['name'] = 'run'
+    target['section']['b'] = [1, 2, 3]
+    target['section']['nested']['d'] = 'new'
+    target['scalar'] = {'now': 'a dict'}
+    target['added'] = True
+    return target
+
+
+def test_diff_configs():
+    diff = diff_configs(_base(), _target())
+    assert sorted(diff.added) == [('added',), ('section', 'nested', 'd')]
+    assert sorted(diff.changed) == [('name',), ('scalar',), ('section', 'b')]
+    assert diff.removed == []
+
+    diff = diff_configs(_target(), _base())
+    assert sorted(diff.removed) == [('added',), ('section', 'nested', 'd')]
+
+
+def test_make_overlay_reproduces_target():
+    base = _base()
+    target = _target()
+    overlay = make_overlay(base, target)
+    assert overlay == {
+        'name': 'run',
+        'section': {'b': [1, 2, 3], 'nested': {'d': 'new'}},
+        'scalar': {'now': 'a dict'},
+        'added': True}
+    result = copy.deepcopy(base)
+    yamlconfig.update_recursive_plain(result, overlay)
+    assert result == target
+
+
+def test_make_overlay_testdata():
+    testfiles = testdata.get_data_files()
+    base = yamlconfig.plain_parse_yaml(testfiles['nested_multi_template'])
+    target = yamlconfig.parse_merge_multiple(
+            [testfiles['nested_multi_template'], testfiles['nested_multi_subset']])
+    overlay = make_overlay(base, target, ignore_unrepresentable=True)
+    result = copy.deepcopy(base)
+    yamlconfig.update_recursive_plain(result, overlay)
+    assert result == target
+
+
+def test_make_overlay_unrepresentable():
+    base = {'section': {'a': 1}, 'keep': 1, 'drop': 1}
+    target = {'section': 'scalar now', 'keep': 2}
+    with pytest.raises(ValueError) as excinfo:
+        make_overlay(base, target)
+    assert 'section' in str(excinfo.value)
+    assert 'drop' in str(excinfo.value)
+    assert make_overlay(base, target, ignore_unrepresentable=True) == {'keep': 2}
+
+
+def test_diff_skips_identical_subtrees():
+    base = _base()
+    target = dict(base, name='run')
+    # shared subtrees are never compared
+    base['section'] = target['section'] = {'a': object()}
+    assert diff_configs(base, target) == ([], [('name',)], [])
+
+
+def test_diff_uses_fingerprints():
+    base = _base()
+    target = copy.deepcopy(base)
+    target['name'] = 'run'
+    base_fp = ConfigFingerprint(base)
+    target_fp = ConfigFingerprint(target)
+    base_fp.digest
+    target_fp.digest
+
+    compared = []
+
+    class CountingList(list):
+        def __ne__(self, other):
+            compared.append(self)
+            return list.__ne__(self, other)
+        __hash__ = None
+
+    base['unchanged']['big'] = CountingList(base['unchanged']['big'])
+    base_fp.invalidate([('unchanged', 'big')])
+    # recompute digests of base, 'unchanged' digest equals target's again
+    diff = diff_configs(base, target, base_fp, target_fp)
+    assert diff == ([], [('name',)], [])
+    assert compared == []
+
+    # without fingerprints the list is compared
+    diff_configs(base, target)
+    assert len(compared) == 1
@@ -0,0 +1,68 @@
+import copy
+from collections import OrderedDict
+
+import yamlconfig
+from yamlconfig import fingerprint as fingerprint_module
+from yamlconfig.fingerprint import fingerprint
+from yamlconfig.fingerprint import ConfigFingerprint
+
+import testdata
+
+
+def test_fingerprint_key_order_insensitive():
+    a = OrderedDict([('x', 1), ('y', {'a': [1, 2], 'b': None})])
+    b = {'y': OrderedDict([('b', None), ('a', [1, 2])]), 'x': 1}
+    assert fingerprint(a) == fingerprint(b)
+
+
+def test_fingerprint_distinguishes_values():
+    base = {'x': 1, 'y': [1, 2]}
+    assert fingerprint(base) != fingerprint({'x': '1', 'y': [1, 2]})
+    assert fingerprint(base) != fingerprint({'x': True, 'y': [1, 2]})
+    assert fingerprint(base) != fingerprint({'x': 1, 'y': [2, 1]})
+    assert fingerprint({'x': {}}) != fingerprint({'x': []})
+
+
+def test_fingerprint_parsed_round_trip():
+    testfiles = testdata.get_data_files()
+    path = testfiles['nested_multi_template']
+    assert (
+        fingerprint(yamlconfig.parse_config_file(path)) ==
+        fingerprint(yamlconfig.parse_config_file(path, round_trip=True)))
+
+
+def test_config_fingerprint_incremental(monkeypatch):
+    config = {
+        'unchanged': {'deep': {'values': list(range(10))}},
+        'changed': {'a': 1, 'b': 2},
+        'removed': 1}
+    fp = ConfigFingerprint(config)
+    before = fp.digest
+
+    stats = yamlconfig.update_recursive(
+            config, {'unchanged': config['unchanged'], 'changed': {'a': 5, 'c': 3}},
+            ignore_notintemplate=False, delete_notinsubset=True, key_paths=True)
+    assert 'removed' not in config
+    assert config['unchanged']['deep']['values'] == list(range(10))
+
+    hashed = []
+    scalar_digest = fingerprint_module._scalar_digest
+
+    def counting(value):
+        hashed.append(value)
+        return scalar_digest(value)
+
+    monkeypatch.setattr(fingerprint_module, '_scalar_digest', counting)
+    after = fp.update(stats)
+
+    # keys of the changed mappings and the changed values, not the untouched list
+    assert 0 not in hashed
+    assert after != before
+    assert after == fingerprint(copy.deepcopy(config))
+    assert fp.digest == after
+
+
+def test_config_fingerprint_subtree():
+    config = {'a': {'b': [1, 2]}, 'c': 1}
+    fp = ConfigFingerprint(config)
+    assert fp.subtree_digest(('a',)) == fingerprint({'b': [1, 2]})
@@ -0,0 +1,57 @@
+import pickle
+
+import pytest
+
+import yamlconfig
+from yamlconfig.frozen import freeze
+from yamlconfig.frozen import thaw
+from yamlconfig.frozen import FrozenConfig
+
+import testdata
+
+
+def test_freeze_thaw_round_trip():
+    testfiles = testdata.get_data_files()
+    for name in ['nested_multi_template', 'merge_linked_linking', 'hello_world']:
+        config = yamlconfig.parse_config_file(testfiles[name], round_trip=True)
+        frozen = freeze(config)
+        assert isinstance(frozen, FrozenConfig)
+        assert thaw(frozen) == yamlconfig.ordered_to_unordered(config)
+
+
+def test_frozen_lookup_and_immutability():
+    config = {'key{}'.format(i): i for i in range(20)}
+    config['nested'] = {'values': [1, 2, {'a': 1}]}
+    frozen = freeze(config)
+
+    assert frozen['key15'] == 15
+    assert frozen['nested']['values'] == (1, 2, FrozenConfig([('a', 1)]))
+    assert 'key3' in frozen
+    assert 'missing' not in frozen
+    with pytest.raises(KeyError):
+        frozen['missing']
+    with pytest.raises(TypeError):
+        frozen['key1'] = 2
+    with pytest.raises(AttributeError):
+        frozen.other = 1
+    assert list(frozen) == list(config)
+
+
+def test_frozen_hashable():
+    a = freeze({'x': [1, 2], 'y': {'z': 'text'}})
+    b = freeze({'y': {'z': 'text'}, 'x': [1, 2]})
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b}) == 1
+    assert a != freeze({'x': [1, 2]})
+
+
+def test_frozen_pickle():
+    frozen = freeze({'a': {'b': [1, 2]}, 'c': None})
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_frozen_interns_strings():
+    a = freeze({'key': ''.join(['some', '_value'])})
+    b = freeze({'key': ''.join(['some_', 'value'])})
+    assert a['key'] is b['key']
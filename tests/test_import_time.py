@@ -0,0 +1,49 @@
+import sys
+import subprocess
+
+import pytest
+
+# -X importtime and subprocess.run
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 7), reason='requires Python 3.7')
+
+
+def _imported_modules(code):
+    """Modules imported by code according to `python -X importtime`"""
+    proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    assert proc.returncode == 0, proc.stderr
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        modules.append(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def _heavy(modules):
+    return [m for m in modules if m.split('.')[0] in ('ruamel', 'click', '_ruamel_yaml')]
+
+
+def test_import_does_not_load_heavy_dependencies():
+    modules = _imported_modules('import yamlconfig')
+    assert 'yamlconfig' in modules
+    assert _heavy(modules) == []
+
+
+def test_merge_does_not_load_heavy_dependencies():
+    modules = _imported_modules(
+            'import yamlconfig\n'
+            'yamlconfig.merge_multiple([{"a": {"b": 1}}, {"a": {"c": 2}}])\n'
+            'yamlconfig.update_recursive({"a": 1}, {"a": 2})\n')
+    assert _heavy(modules) == []
+
+
+def test_parse_loads_ruamel_on_first_use(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write('a: 1\n')
+    modules = _imported_modules(
+            'import yamlconfig\n'
+            'assert yamlconfig.parse_config_file({!r}) == {{"a": 1}}\n'.format(str(configfile)))
+    assert 'ruamel.yaml' in modules
+    assert 'click' not in modules
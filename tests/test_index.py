@@ -0,0 +1,84 @@
+import copy
+
+import pytest
+
+import yamlconfig
+from yamlconfig.index import ConfigIndex, get_path, set_path, split_path
+
+import testdata
+
+
+def _config():
+    return {
+        'name': 'config',
+        'processing': {'bands': {'red': {'scale': 2}, 'nir': {'scale': 3}}},
+        'values': [1, 2]}
+
+
+def test_get_set_path():
+    config = _config()
+    assert split_path('a.b') == ('a', 'b')
+    assert get_path(config, 'processing.bands.red.scale') == 2
+    assert get_path(config, ('processing', 'bands')) is config['processing']['bands']
+    assert get_path(config, 'processing.missing', default=None) is None
+    with pytest.raises(KeyError):
+        get_path(config, 'name.deeper')
+
+    set_path(config, 'processing.bands.blue.scale', 4)
+    assert config['processing']['bands']['blue'] == {'scale': 4}
+    with pytest.raises(KeyError):
+        set_path(config, 'values.x', 1)
+
+
+def test_set_path_keeps_type():
+    testfiles = testdata.get_data_files()
+    config = yamlconfig.plain_parse_yaml(testfiles['nested_multi_template'], round_trip=True)
+    set_path(config, 'new.section', 1)
+    assert type(config['new']) is type(config)
+
+
+def test_index_lookup():
+    config = _config()
+    index = ConfigIndex(config)
+    assert index['processing.bands.red.scale'] == 2
+    assert index[('processing', 'bands', 'nir', 'scale')] == 3
+    assert 'processing.bands' in index
+    assert 'processing.bands.green' not in index
+    assert sorted(index) == sorted([
+        ('name',), ('processing',), ('values',),
+        ('processing', 'bands'),
+        ('processing', 'bands', 'red'), ('processing', 'bands', 'red', 'scale'),
+        ('processing', 'bands', 'nir'), ('processing', 'bands', 'nir', 'scale')])
+    container, key = index.parent('processing.bands.red.scale')
+    assert container is config['processing']['bands']['red'] and key == 'scale'
+
+    # in-place value changes are seen without re-indexing
+    config['processing']['bands']['red']['scale'] = 5
+    assert index['processing.bands.red.scale'] == 5
+
+
+def test_index_update_recursive():
+    config = _config()
+    index = ConfigIndex(config)
+    stats = index.update_recursive(
+            {'processing': {'bands': {'red': {'scale': 1}, 'green': {'scale': 7}}},
+             'name': {'now': 'nested'}},
+            ignore_notintemplate=False)
+    assert stats.added == 1
+    assert index['processing.bands.green.scale'] == 7
+    assert index['name.now'] == 'nested'
+    assert dict(index) == dict(ConfigIndex(copy.deepcopy(config)))
+
+    index.update_recursive({'processing': {}}, delete_notinsubset=True)
+    assert sorted(index) == [('processing',)]
+
+
+def test_index_set():
+    config = _config()
+    index = ConfigIndex(config)
+    index.set('processing.bands.red', {'offset': 1})
+    index.set('new.deep.key', 1)
+    assert index['processing.bands.red.offset'] == 1
+    assert 'processing.bands.red.scale' not in index
+    assert index['new.deep.key'] == 1
+    assert dict(index) == dict(ConfigIndex(config))
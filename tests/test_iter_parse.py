@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+import yamlconfig
+
+
+def _write_stream(path, ndocs, broken_last=False):
+    with open(str(path), 'w') as fout:
+        for i in range(ndocs):
+            fout.write('---\nscene: {}\nsettings:\n  scale: {}\ninput_file: scene{}.tif\n'.format(i, i, i))
+        if broken_last:
+            fout.write('---\n[unclosed\n')
+
+
+def test_iter_parse_yaml(tmpdir):
+    streamfile = tmpdir.join('stream.yaml')
+    _write_stream(streamfile, 100)
+    documents = list(yamlconfig.iter_parse_yaml(str(streamfile)))
+    assert len(documents) == 100
+    assert documents[42] == {'scene': 42, 'settings': {'scale': 42}, 'input_file': 'scene42.tif'}
+
+
+def test_iter_parse_yaml_is_lazy(tmpdir):
+    streamfile = tmpdir.join('stream.yaml')
+    _write_stream(streamfile, 3, broken_last=True)
+    documents = yamlconfig.iter_parse_yaml(str(streamfile))
+    assert next(documents)['scene'] == 0
+    with pytest.raises(Exception):
+        list(documents)
+
+
+def test_iter_parse_yaml_base_and_rootdir(tmpdir):
+    streamfile = tmpdir.join('stream.yaml')
+    _write_stream(streamfile, 2)
+    base = {'settings': {'scale': -1, 'offset': 0}, 'name': 'base'}
+
+    documents = list(yamlconfig.iter_parse_yaml(
+        str(streamfile), base=base, join_rootdir=True))
+
+    assert documents[1] == {
+        'settings': {'scale': 1, 'offset': 0},
+        'name': 'base',
+        'scene': 1,
+        'input_file': os.path.join(str(tmpdir), 'scene1.tif')}
+    assert base == {'settings': {'scale': -1, 'offset': 0}, 'name': 'base'}
+
+
+def test_iter_parse_yaml_empty_document(tmpdir):
+    streamfile = tmpdir.join('stream.yaml')
+    streamfile.write('---\na_file: x\n---\n---\nb: 2\n')
+    documents = list(yamlconfig.iter_parse_yaml(str(streamfile), join_rootdir=True))
+    assert documents == [
+        {'a_file': os.path.join(str(tmpdir), 'x')},
+        None,
+        {'b': 2}]
+
+
+def test_iter_parse_yaml_empty_document_base(tmpdir):
+    streamfile = tmpdir.join('stream.yaml')
+    streamfile.write('---\nb: 2\n---\n---\nb: 3\n')
+    base = {'a': 1}
+    documents = list(yamlconfig.iter_parse_yaml(str(streamfile), base=base))
+    assert documents == [{'a': 1, 'b': 2}, {'a': 1}, {'a': 1, 'b': 3}]
+    assert documents[1] is not base
+    documents[1]['a'] = 0
+    assert base == {'a': 1}
@@ -0,0 +1,121 @@
+import sys
+
+import pytest
+
+import yamlconfig
+from yamlconfig.lazy import LazyConfig
+from yamlconfig.cache import ParseCache
+
+import testdata
+
+
+def _all_configs():
+    testfiles = testdata.get_data_files()
+    return [
+        testfiles[name] for name in sorted(testfiles)
+        if not name.startswith('linked_cycle')]
+
+
+@pytest.mark.parametrize('join_rootdir', [False, True])
+def test_lazy_matches_eager(join_rootdir):
+    for configfile in _all_configs():
+        expected = yamlconfig.parse_config_file(configfile, join_rootdir=join_rootdir)
+        result = yamlconfig.parse_config_file(
+                configfile, join_rootdir=join_rootdir, lazy=True)
+        assert isinstance(result, LazyConfig)
+        assert list(result) == list(expected), configfile
+        assert result.materialize() == yamlconfig.ordered_to_unordered(expected), configfile
+
+
+def test_lazy_builds_on_access():
+    testfiles = testdata.get_data_files()
+    config = yamlconfig.parse_config_file(testfiles['linked_diamond_top'], lazy=True)
+    assert config.accessed == []
+
+    base_only = config['base_only']
+    assert isinstance(base_only, LazyConfig)
+    assert config.accessed == ['base_only']
+    assert base_only['foo'] == 'bar'
+    assert config['side'] == 'left'
+    assert 'right_only' in config
+    assert sorted(config.accessed) == ['base_only', 'side']
+
+
+def test_lazy_merge_multiple():
+    testfiles = testdata.get_data_files()
+    infiles = [testfiles[k] for k in ['merge_multi1', 'merge_multi2']]
+    expected = yamlconfig.parse_merge_multiple(infiles)
+    result = yamlconfig.parse_merge_multiple(infiles, lazy=True)
+    assert isinstance(result, LazyConfig)
+    assert result == yamlconfig.ordered_to_unordered(expected)
+
+
+def test_lazy_merge_keys(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write(
+        'base: &base\n  a: 1\n  some_dir: foo\n'
+        'other:\n  <<: *base\n  a: 2\n')
+    config = yamlconfig.parse_config_file(str(configfile), lazy=True, join_rootdir=True)
+    assert config['other']['a'] == 2
+    assert config['other']['some_dir'] == str(tmpdir.join('foo'))
+
+
+def test_lazy_invalid_options():
+    testfiles = testdata.get_data_files()
+    with pytest.raises(ValueError):
+        yamlconfig.parse_config_file(testfiles['hello'], lazy=True, round_trip=True)
+    with pytest.raises(ValueError):
+        yamlconfig.parse_config_file(testfiles['hello'], lazy=True, cache=ParseCache())
+
+
+@pytest.mark.parametrize('text', [
+    'a: 1\nb:\n  c: [1, 2]\n  d: {e: f}\n',
+    'a:\n  b:\n    - x: 1\n      y: 2\n  c: |\n    text\n    more\n',
+    'a: {b: {c: 1}, d: [2]}\ne: 3\n',
+    '? complex\n: value\nother: 1\n',
+    'a: &anchor\n  b: 1\nc: *anchor\n',
+    '"quoted key": 1\n\'single\': {x: 1}\n',
+    '# comment\na: 1 # trailing\n\nb:\n  # inner\n  c: 2\n',
+])
+def test_lazy_slices_match_eager(tmpdir, text):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write(text)
+    expected = yamlconfig.plain_parse_yaml(str(configfile))
+    config = yamlconfig.parse_config_file(str(configfile), lazy=True)
+    for key in expected:
+        value = config[key]
+        if isinstance(value, LazyConfig):
+            value = value.materialize()
+        assert value == expected[key]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 4), reason='needs tracemalloc')
+def test_lazy_retains_less_than_eager(tmpdir):
+    import tracemalloc
+    configfile = tmpdir.join('config.yaml')
+    sections = {
+        'section{}'.format(i): {
+            'values{}'.format(j): ['item{}_{}'.format(j, k) for k in range(20)]
+            for j in range(20)}
+        for i in range(20)}
+    yamlconfig.save_to_yaml(
+            sections, str(configfile), round_trip=False, default_flow_style=False)
+
+    def _retained(func):
+        tracemalloc.start()
+        result = func()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return retained
+
+    def _lazy_one_section():
+        config = yamlconfig.parse_config_file(str(configfile), lazy=True)
+        config['section0']['values0']
+        return config
+
+    # warm up module-level caches
+    _lazy_one_section()
+    eager = _retained(lambda: yamlconfig.parse_config_file(str(configfile)))
+    lazy = _retained(_lazy_one_section)
+    assert lazy < eager / 2
@@ -1,3 +1,7 @@
+import os
+
+import pytest
+
 import yamlconfig
 
 import testdata
@@ -11,3 +15,34 @@ def test_parse_merge_linked_files():
     expected = yamlconfig.ordered_to_unordered(expected)
     result = yamlconfig.parse_config_file(infile, merge_linked_files=True)
     assert yamlconfig.ordered_to_unordered(result) == expected
+
+
+def test_parse_diamond_linked_files_once(monkeypatch):
+    testfiles = testdata.get_data_files()
+    parsed = []
+    plain_parse_yaml = yamlconfig.parse.plain_parse_yaml
+
+    def counting_parse(configfile, **kwargs):
+        parsed.append(os.path.basename(configfile))
+        return plain_parse_yaml(configfile, **kwargs)
+
+    monkeypatch.setattr(yamlconfig.parse, 'plain_parse_yaml', counting_parse)
+    result = yamlconfig.parse_config_file(testfiles['linked_diamond_top'])
+
+    assert sorted(parsed) == sorted([
+        'linked_diamond_top.yaml', 'linked_diamond_left.yaml',
+        'linked_diamond_right.yaml', 'linked_diamond_base.yaml'])
+    assert yamlconfig.ordered_to_unordered(result) == {
+        'name': 'top',
+        'side': 'left',
+        'right_only': True,
+        'base_only': {'foo': 'bar'}}
+
+
+def test_parse_linked_files_cycle():
+    testfiles = testdata.get_data_files()
+    with pytest.raises(yamlconfig.LinkedConfigCycleError) as excinfo:
+        yamlconfig.parse_config_file(testfiles['linked_cycle_a'])
+    message = str(excinfo.value)
+    assert 'linked_cycle_a.yaml -> ' in message
+    assert 'linked_cycle_b.yaml -> ' in message
@@ -1,3 +1,7 @@
+import copy
+
+import pytest
+
 import yamlconfig
 
 import testdata
@@ -14,3 +18,68 @@ def test_parse_merge_multiple():
     result = yamlconfig.parse_merge_multiple(infiles)
 
     assert yamlconfig.ordered_to_unordered(result) == expected_unordered
+
+
+def _merge_reference(configdicts):
+    configdicts = list(configdicts)
+    cfd = copy.deepcopy(configdicts[0])
+    for newcfd in configdicts[1:]:
+        yamlconfig.update_recursive_plain(cfd, copy.deepcopy(newcfd))
+    return cfd
+
+
+def test_merge_multiple_matches_update_recursive():
+    testfiles = testdata.get_data_files()
+    dicts = [
+        yamlconfig.plain_parse_yaml(testfiles['nested_multi_template']),
+        yamlconfig.plain_parse_yaml(testfiles['nested_multi_subset']),
+        {'level1': 'scalar does not replace dict', 'scalar': {'dict': 'replaces scalar'}},
+        {'scalar': {'more': 1}, 'new': [1, 2]}]
+    dicts[0]['scalar'] = 5
+    expected = _merge_reference(dicts)
+    result = yamlconfig.merge_multiple(dicts)
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_merge_multiple_does_not_modify_inputs():
+    first = {'a': {'b': 1, 'c': [1]}, 'd': {'e': 1}}
+    second = {'a': {'b': 2}, 'f': {'g': 1}}
+    first_copy = copy.deepcopy(first)
+    second_copy = copy.deepcopy(second)
+
+    result = yamlconfig.merge_multiple(iter([first, second]))
+
+    assert first == first_copy
+    assert second == second_copy
+    assert result == {'a': {'b': 2, 'c': [1]}, 'd': {'e': 1}, 'f': {'g': 1}}
+    # untouched subtrees are shared
+    assert result['d'] is first['d']
+    assert result['f'] is second['f']
+
+
+def test_merge_multiple_keeps_first_format():
+    import ruamel.yaml
+    first = ruamel.yaml.round_trip_load('commonkey: value1  # first comment\nonly1key: value1\n')
+    second = ruamel.yaml.round_trip_load('commonkey: value2\nonly2key: value2\n')
+    result = yamlconfig.merge_multiple([first, second])
+    assert type(result) is type(first)
+    dumped = ruamel.yaml.round_trip_dump(result)
+    assert dumped.startswith('commonkey: value2  # first comment\n')
+
+
+@pytest.mark.parametrize('pool', ['thread', 'process'])
+def test_parse_merge_multiple_concurrent(pool):
+    testfiles = testdata.get_data_files()
+    infiles = [testfiles[k] for k in ['merge_multi1', 'merge_multi2', 'merge_linked_linking']]
+
+    expected = yamlconfig.parse_merge_multiple(infiles)
+    result = yamlconfig.parse_merge_multiple(infiles, max_workers=2, pool=pool)
+
+    assert list(result.items()) == list(expected.items())
+
+
+def test_parse_merge_multiple_invalid_pool():
+    testfiles = testdata.get_data_files()
+    with pytest.raises(ValueError):
+        yamlconfig.parse_merge_multiple([testfiles['merge_multi1']], max_workers=2, pool='fibers')
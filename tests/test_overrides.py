@@ -0,0 +1,101 @@
+import pytest
+import click
+from click.testing import CliRunner
+
+import yamlconfig
+from yamlconfig.click_option import yaml_config_option
+from yamlconfig.overrides import (
+        apply_overrides, build_overrides, env_overrides, parse_value, set_overrides)
+
+
+def test_parse_value():
+    assert parse_value('2') == 2
+    assert parse_value('2.5') == 2.5
+    assert parse_value('true') is True
+    assert parse_value('null') is None
+    assert parse_value('[a, b]') == ['a', 'b']
+    assert parse_value('hello') == 'hello'
+    assert parse_value('foo: bar') == 'foo: bar'
+    assert parse_value('- a') == '- a'
+    assert parse_value('a: [') == 'a: ['
+
+
+def test_env_overrides():
+    environ = {
+        'MYAPP_PROCESSING__SCALE': '2',
+        'MYAPP_NAME': 'run1',
+        'MYAPP_': 'ignored',
+        'OTHER_NAME': 'ignored'}
+    assert env_overrides('MYAPP_', environ=environ) == {
+        'processing': {'scale': 2}, 'name': 'run1'}
+
+
+def test_env_overrides_match_config_case():
+    environ = {'MYAPP_INPUTFILE': 'in.tif', 'MYAPP_SUB__OUTDIR': 'out', 'MYAPP_NEW': '1'}
+    config = {'inputFile': 'x', 'Sub': {'outDir': 'y'}}
+    assert env_overrides('MYAPP_', environ=environ, config=config) == {
+        'inputFile': 'in.tif', 'Sub': {'outDir': 'out'}, 'new': 1}
+
+
+def test_set_overrides():
+    overrides = set_overrides(['a.b=1', 'a.c=x=y', 'a.b=2', 'd=[1, 2]'])
+    assert overrides == {'a': {'b': 2, 'c': 'x=y'}, 'd': [1, 2]}
+    with pytest.raises(ValueError):
+        set_overrides(['a.b'])
+    with pytest.raises(ValueError):
+        set_overrides(['=1'])
+
+
+def test_set_overrides_later_wins():
+    assert set_overrides(['a.b=2', 'a=1']) == {'a': 1}
+    assert set_overrides(['a=1', 'a.b=2']) == {'a': {'b': 2}}
+
+
+def test_build_overrides_set_wins():
+    environ = {'APP_A__B': '1', 'APP_A__C': '1'}
+    overrides = build_overrides(env_prefix='APP_', set_items=['a.b=2'], environ=environ)
+    assert overrides == {'a': {'b': 2, 'c': 1}}
+    assert build_overrides() == {}
+    overrides = build_overrides(env_prefix='X_', set_items=['a=5'], environ={'X_A__B': '1'})
+    assert overrides == {'a': 5}
+
+
+def test_apply_overrides_shares_untouched():
+    config = {'a': {'b': 1, 'c': 2}, 'big': {'x': list(range(10))}}
+    result = apply_overrides(config, {'a': {'b': 3}})
+    assert result == {'a': {'b': 3, 'c': 2}, 'big': {'x': list(range(10))}}
+    assert result['big'] is config['big']
+    assert config['a']['b'] == 1
+    assert apply_overrides(config, {}) is config
+    with pytest.raises(ValueError):
+        apply_overrides(config, {'a': 5})
+
+
+def test_parse_merge_multiple_overrides(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write('a: {b: 1, c: 2}\nd: {e: 3}\n')
+    config = yamlconfig.parse_merge_multiple(
+            [str(configfile)], overrides={'a': {'b': 5}})
+    assert config == {'a': {'b': 5, 'c': 2}, 'd': {'e': 3}}
+    with pytest.raises(ValueError):
+        yamlconfig.parse_merge_multiple([str(configfile)], overrides={'a': 1}, lazy=True)
+    with pytest.raises(ValueError):
+        yamlconfig.parse_merge_multiple([str(configfile)], overrides={'d': 1})
+
+
+def test_click_overrides(tmpdir, monkeypatch):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write('a: {b: 1, c: 2}\nname: config\n')
+    monkeypatch.setenv('MYAPP_A__C', '3')
+    monkeypatch.setenv('MYAPP_NAME', 'env')
+
+    @click.command()
+    @yaml_config_option(env_prefix='MYAPP_', setflag='--set')
+    def main(**kwargs):
+        click.echo(sorted(kwargs.items()))
+
+    runner = CliRunner()
+    result = runner.invoke(
+            main, ['-c', str(configfile), '--set', 'name=cli', '--set', 'a.b=1.5'],
+            catch_exceptions=False)
+    assert result.output == str([('a', {'b': 1.5, 'c': 3}), ('name', 'cli')]) + '\n'
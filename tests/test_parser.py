@@ -1,3 +1,4 @@
+import sys
 import copy
 
 import yamlconfig
@@ -87,3 +88,42 @@ def test_update_recursive_ignore_delete():
             delete_notinsubset=True)
     expected = testconfig['expected_deletenotinsubset']
     assert to_update == expected
+
+
+def _nested(depth, leaf):
+    root = node = {}
+    for _ in range(depth):
+        node['child'] = {}
+        node = node['child']
+    node.update(leaf)
+    return root
+
+
+def test_update_recursive_deep():
+    depth = sys.getrecursionlimit() * 2
+    template = _nested(depth, {'a': 1, 'b': 1})
+    subset = _nested(depth, {'a': 2, 'c': 2})
+
+    stats = yamlconfig.update_recursive(
+            template, subset,
+            ignore_notintemplate=False, delete_notinsubset=True)
+
+    assert stats[:3] == (1, 1, 1)
+    node = template
+    for _ in range(depth):
+        node = node['child']
+    assert node == {'a': 2, 'c': 2}
+
+
+def test_update_recursive_stats():
+    template = {'a': 1, 'b': {'c': 1, 'd': 1}, 'e': 1}
+    subset = {'a': 2, 'b': {'c': 2, 'f': 2}, 'g': 2}
+
+    stats = yamlconfig.update_recursive(
+            template, subset,
+            ignore_notintemplate=True, delete_notinsubset=True, key_paths=True)
+
+    assert stats[:3] == (0, 2, 2)
+    assert sorted(stats.paths) == [('a',), ('b', 'c'), ('b', 'd'), ('e',)]
+    assert template == {'a': 2, 'b': {'c': 2}}
+    assert yamlconfig.update_recursive({'a': 1}, {'a': 2}).paths is None
@@ -1,5 +1,6 @@
 import os
 import sys
+import copy
 
 import pytest
 
@@ -15,6 +16,31 @@ def test_key_matches():
                 key, regex=rootdir_logic.default_key_regex, exclude=['rootdir'])
 
 
+def test_path_key_matcher():
+    matcher = rootdir_logic.PathKeyMatcher()
+    for key in matching_keys:
+        assert matcher(key)
+    for key in not_matching + ['rootdir', 5, None]:
+        assert not matcher(key)
+
+
+def test_path_key_matcher_custom():
+    matcher = rootdir_logic.PathKeyMatcher(regex=['.*_path$'], exclude=['skip_path'])
+    configdict = {
+        'rootdir': '/absolute/path',
+        'some_path': 'foo',
+        'skip_path': 'foo',
+        'some_dir': 'foo',
+        'nested': {'other_path': 'foo'}}
+    joined = rootdir_logic.join_paths_with_rootdir(
+            configdict, matcher=matcher, default_rootdir='/absolute/path')
+    expected = os.path.abspath('/absolute/path/foo')
+    assert joined['some_path'] == expected
+    assert joined['skip_path'] == 'foo'
+    assert joined['some_dir'] == 'foo'
+    assert joined['nested']['other_path'] == expected
+
+
 def test_join_paths_with_rootdir():
     rootdir = '/absolute/path'
     relative_path = 'relative/path'
@@ -104,3 +130,24 @@ def test_remove_rootdir_from_paths_windows():
     assert after['absolute_dir'] == before['absolute_dir']
     assert after['relative_dir'] == before['relative_dir']
     assert after['remove_root_dir'] == 'additional'
+
+
+def test_relative_paths_view():
+    rootdir = os.path.abspath('/absolute/path')
+    unchanged = {'name': 'no paths', 'values': [1, 2]}
+    configdict = {
+            'rootdir': rootdir,
+            'joined_dir': os.path.join(rootdir, 'relative'),
+            'nested': {
+                'rootdir': rootdir,
+                'joined_file': os.path.join(rootdir, 'file.txt')},
+            'unchanged': unchanged}
+    expected = copy.deepcopy(configdict)
+    rootdir_logic.remove_rootdir_from_paths(expected)
+    before = copy.deepcopy(configdict)
+
+    view = rootdir_logic.relative_paths_view(configdict)
+    assert view == expected
+    assert configdict == before
+    assert view['unchanged'] is unchanged
+    assert rootdir_logic.relative_paths_view(unchanged) is unchanged
@@ -0,0 +1,63 @@
+import os
+import stat
+
+import pytest
+
+import yamlconfig
+
+from test_backends import backends
+
+
+def _config(rootdir):
+    return {
+        'rootdir': rootdir,
+        'input_file': os.path.join(rootdir, 'data', 'input.tif'),
+        'section': {'name': 'section', 'values': list(range(10))},
+        'input_files': ['a.tif', 'b.tif']}
+
+
+def test_save_does_not_modify_input(tmpdir):
+    rootdir = str(tmpdir)
+    config = _config(rootdir)
+    yamlfile = str(tmpdir.join('config.yaml'))
+    yamlconfig.save_to_yaml(config, yamlfile, round_trip=False)
+    assert config == _config(rootdir)
+    saved = yamlconfig.plain_parse_yaml(yamlfile)
+    assert saved['input_file'] == os.path.join('data', 'input.tif')
+
+
+def test_save_atomic(tmpdir):
+    yamlfile = tmpdir.join('config.yaml')
+    yamlfile.write('name: old\n')
+    with pytest.raises(Exception):
+        yamlconfig.save_to_yaml({'name': object()}, str(yamlfile), round_trip=False)
+    assert yamlfile.read() == 'name: old\n'
+    assert tmpdir.listdir() == [yamlfile]
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX permissions')
+def test_save_keeps_permissions(tmpdir):
+    yamlfile = tmpdir.join('config.yaml')
+    yamlfile.write('name: old\n')
+    os.chmod(str(yamlfile), 0o640)
+    yamlconfig.save_to_yaml({'name': 'new'}, str(yamlfile))
+    assert stat.S_IMODE(os.stat(str(yamlfile)).st_mode) == 0o640
+
+
+@pytest.mark.parametrize('backend', backends)
+@pytest.mark.parametrize('default_flow_style', [True, False, None])
+def test_save_stream_equivalent(backend, default_flow_style, tmpdir):
+    config = _config(str(tmpdir))
+    config['section']['paths'] = ['/data/{}.tif'.format(i) for i in range(100)]
+    config['section']['empty'] = {}
+    expected_file = tmpdir.join('expected.yaml')
+    result_file = tmpdir.join('result.yaml')
+    kwargs = dict(round_trip=False, backend=backend, default_flow_style=default_flow_style)
+    yamlconfig.save_to_yaml(config, str(expected_file), **kwargs)
+    yamlconfig.save_to_yaml(config, str(result_file), stream=True, **kwargs)
+    assert result_file.read() == expected_file.read()
+
+
+def test_save_stream_round_trip():
+    with pytest.raises(ValueError):
+        yamlconfig.save_to_yaml({}, 'config.yaml', stream=True)
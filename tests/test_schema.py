@@ -0,0 +1,126 @@
+import os
+
+import pytest
+import click
+from click.testing import CliRunner
+
+from yamlconfig.schema import Schema, Field, SchemaError
+from yamlconfig.postproc import check_required_keys, RequiredKeysError
+from yamlconfig.click_type import YAMLConfig
+from yamlconfig.click_option import yaml_config_option
+
+import testdata
+
+
+def test_schema_valid_sets_defaults():
+    schema = Schema({
+        'name': str,
+        'section': {
+            'scale': Field(float, default=1.0),
+            'count': int,
+            'anything': None}})
+    config = {'name': 'a', 'section': {'count': 2, 'anything': [1]}}
+    assert schema.validate(config) is config
+    assert config['section']['scale'] == 1.0
+
+
+def test_schema_collects_all_errors():
+    schema = Schema({
+        'name': str,
+        'section': {
+            'count': int,
+            'flag': bool,
+            'nested': {'deep': str}}})
+    config = {'section': {'count': True, 'flag': 1, 'nested': 'x'}}
+    with pytest.raises(SchemaError) as excinfo:
+        schema.validate(config)
+    assert excinfo.value.errors == [
+        'name: missing required key',
+        'section.count: expected int, got bool',
+        'section.flag: expected bool, got int',
+        'section.nested: expected mapping, got str']
+    assert isinstance(excinfo.value, RequiredKeysError)
+    assert isinstance(excinfo.value, ValueError)
+
+
+def test_schema_optional_and_float_accepts_int():
+    schema = Schema({'scale': float, 'opt': Field(str, required=False)})
+    config = {'scale': 2}
+    schema.validate(config)
+    assert 'opt' not in config
+
+
+def test_schema_path_fields(tmpdir):
+    rootdir = str(tmpdir)
+    schema = Schema({
+        'out': Field(str, path=True),
+        'inputs': Field(list, path=True),
+        'sub': {'file': Field(str, path=True)}})
+    config = {
+        'rootdir': rootdir, 'out': 'out.tif', 'inputs': ['a', 'b'],
+        'sub': {'file': 'f.txt'}}
+    schema.validate(config)
+    assert config['out'] == os.path.join(rootdir, 'out.tif')
+    assert config['inputs'] == [os.path.join(rootdir, 'a'), os.path.join(rootdir, 'b')]
+    assert config['sub']['file'] == os.path.join(rootdir, 'f.txt')
+
+
+def test_schema_rootdir_argument_overrides_config(tmpdir):
+    config = {'rootdir': 'from_config', 'out': 'out.tif'}
+    Schema({'out': Field(str, path=True)}).validate(config, rootdir=str(tmpdir))
+    assert config['out'] == os.path.join(str(tmpdir), 'out.tif')
+
+
+def test_schema_default_not_shared():
+    schema = Schema({'bands': Field(list, default=[])})
+    first = schema.validate({})
+    second = schema.validate({})
+    first['bands'].append('red')
+    assert second['bands'] == []
+
+
+def test_schema_path_without_rootdir():
+    config = {'out': 'out.tif'}
+    Schema({'out': Field(str, path=True)}).validate(config)
+    assert config['out'] == 'out.tif'
+
+
+def test_check_required_keys_schema():
+    check_required_keys({'a': {'b': 1}}, {'a': {'b': int}})
+    with pytest.raises(RequiredKeysError):
+        check_required_keys({'a': {}}, Schema({'a': {'b': int}}))
+
+
+def test_click_type_schema():
+    testfiles = testdata.get_data_files()
+    yamltype = YAMLConfig(required_keys={'name': str, 'greeting': str, 'extra': Field(default=1)})
+    config = yamltype.convert(testfiles['hello_world'], None, None)
+    assert config['extra'] == 1
+
+    yamltype = YAMLConfig(required_keys={'name': int})
+    with pytest.raises(click.BadParameter):
+        yamltype.convert(testfiles['hello_world'], None, None)
+
+
+def test_click_option_schema():
+    testfiles = testdata.get_data_files()
+    inp = ['-c', testfiles['hello']]
+
+    @click.command()
+    @yaml_config_option(keys={'greeting': str, 'name': Field(str, default='tough guy')})
+    def main(**kwargs):
+        click.echo('{greeting} {name}'.format(**kwargs))
+
+    runner = CliRunner()
+    result = runner.invoke(main, inp, catch_exceptions=False)
+    assert result.exit_code == 0
+    assert result.output == 'hello tough guy\n'
+
+    @click.command()
+    @yaml_config_option(keys={'greeting': int, 'missing': str})
+    def fails(**kwargs):
+        pass
+
+    with pytest.raises(SchemaError) as excinfo:
+        runner.invoke(fails, inp, catch_exceptions=False)
+    assert len(excinfo.value.errors) == 2
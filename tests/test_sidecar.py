@@ -0,0 +1,109 @@
+import os
+
+import yamlconfig
+from yamlconfig import sidecar
+from yamlconfig.source import FileSource
+
+import testdata
+
+
+def _forbid_parsing(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('YAML was parsed')
+    monkeypatch.setattr(yamlconfig.parse, 'plain_parse_yaml', fail)
+
+
+def test_sidecar_reused(tmpdir, monkeypatch):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS)
+    sidecar_dir = str(tmpdir.join('cache'))
+
+    expected = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    assert len(os.listdir(sidecar_dir)) == 1
+
+    _forbid_parsing(monkeypatch)
+    result = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    assert result == expected
+
+
+def test_sidecar_invalidated_by_linked_file(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS)
+    sidecar_dir = str(tmpdir.join('cache'))
+
+    yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    testdata.write_file(tmpdir.join('linked.yaml'), 'bar: changed\n')
+    result = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    assert result['bar'] == 'changed'
+
+
+def test_sidecar_invalidated_by_version(tmpdir, monkeypatch):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS)
+    sidecar_dir = str(tmpdir.join('cache'))
+    yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    path = sidecar.sidecar_path(
+            sidecar_dir, configfile, join_rootdir=False, merge_linked_files=True,
+            round_trip=False, rootdir_kwargs={}, basedir=str(tmpdir))
+    assert sidecar.load_sidecar(path) is not None
+
+    monkeypatch.setattr(yamlconfig, '__version__', '0.0')
+    assert sidecar.load_sidecar(path) is None
+
+
+def test_sidecar_options_in_key(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS)
+    sidecar_dir = str(tmpdir.join('cache'))
+    yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir, round_trip=True)
+    assert len(os.listdir(sidecar_dir)) == 2
+
+
+def test_corrupt_sidecar_ignored(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS)
+    sidecar_dir = str(tmpdir.join('cache'))
+    expected = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    for name in os.listdir(sidecar_dir):
+        testdata.write_file(os.path.join(sidecar_dir, name), 'not a pickle')
+
+    result = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    assert result == expected
+    # rewritten
+    result = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    assert result == expected
+    assert not [name for name in os.listdir(sidecar_dir) if name.endswith('.tmp')]
+
+
+def test_sidecar_file_changed_while_parsing(tmpdir, monkeypatch):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS)
+    sidecar_dir = str(tmpdir.join('cache'))
+    load_layer = yamlconfig.parse._load_layer
+
+    def load_then_rewrite(path, **kwargs):
+        result = load_layer(path, **kwargs)
+        if str(path).endswith('linked.yaml'):
+            testdata.write_file(tmpdir.join('linked.yaml'), 'bar: newer\n')
+        return result
+
+    monkeypatch.setattr(yamlconfig.parse, '_load_layer', load_then_rewrite)
+    result = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    assert result['bar'] == 'linked'
+    monkeypatch.setattr(yamlconfig.parse, '_load_layer', load_layer)
+    result = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    assert result['bar'] == 'newer'
+
+
+def test_sidecar_basedir_in_key(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    testdata.write_file(configfile, 'in_file: x.tif\n')
+    sidecar_dir = str(tmpdir.join('cache'))
+    for basedir in ['/one', '/two']:
+        result = yamlconfig.parse_config_file(
+                str(configfile), join_rootdir=True, basedir=basedir, sidecar_dir=sidecar_dir)
+        assert result['in_file'] == os.path.join(basedir, 'x.tif')
+
+
+def test_sidecar_file_source(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.LINKED_CONFIGS)
+    sidecar_dir = str(tmpdir.join('cache'))
+    expected = yamlconfig.parse_config_file(configfile, sidecar_dir=sidecar_dir)
+    result = yamlconfig.parse_config_file(FileSource(configfile), sidecar_dir=sidecar_dir)
+    assert result == expected
+    assert len(os.listdir(sidecar_dir)) == 1
@@ -0,0 +1,78 @@
+import io
+import os
+import mmap
+
+import pytest
+
+import yamlconfig
+from yamlconfig.cache import ParseCache
+from yamlconfig.source import as_source, BufferSource, FileSource, StreamSource
+
+import testdata
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as fin:
+        return fin.read()
+
+
+def test_as_source():
+    assert isinstance(as_source('config.yaml'), FileSource)
+    assert isinstance(as_source(u'config.yaml'), FileSource)
+    assert isinstance(as_source(b'a: 1'), BufferSource)
+    assert isinstance(as_source(io.StringIO(u'a: 1')), StreamSource)
+    source = BufferSource(u'a: 1')
+    assert as_source(source) is source
+    with pytest.raises(TypeError):
+        as_source(1)
+
+
+@pytest.mark.parametrize('make_source', [
+    lambda data: data,
+    lambda data: BufferSource(data.decode('utf-8')),
+    lambda data: io.BytesIO(data),
+    lambda data: io.StringIO(data.decode('utf-8'))])
+def test_parse_in_memory_with_basedir(make_source):
+    testfiles = testdata.get_data_files()
+    infile = testfiles['merge_linked_linking']
+    expected = yamlconfig.parse_config_file(infile, join_rootdir=True)
+    source = make_source(_read_bytes(infile))
+    result = yamlconfig.parse_config_file(
+            source, join_rootdir=True, basedir=os.path.dirname(infile))
+    assert result == expected
+
+
+def test_parse_mmap(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write('a: 1\nb: [1, 2]\n')
+    with open(str(configfile), 'rb') as fin:
+        mm = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            assert yamlconfig.plain_parse_yaml(mm) == {'a': 1, 'b': [1, 2]}
+            # read from the start again
+            assert yamlconfig.parse_config_file(mm, lazy=True).materialize() == {'a': 1, 'b': [1, 2]}
+        finally:
+            mm.close()
+
+
+def test_parse_file_with_basedir(tmpdir):
+    configfile = tmpdir.join('config.yaml')
+    configfile.write('out_file: out.tif\n')
+    result = yamlconfig.parse_config_file(str(configfile), join_rootdir=True, basedir='/data')
+    assert result['out_file'] == os.path.abspath('/data/out.tif')
+
+
+def test_cache_ignored_for_buffers():
+    cache = ParseCache()
+    assert yamlconfig.parse_config_file(b'a: 1\n', cache=cache) == {'a': 1}
+    assert len(cache) == 0
+
+
+def test_iter_parse_bytes():
+    docs = list(yamlconfig.iter_parse_yaml(b'a: 1\n---\na: 2\n'))
+    assert docs == [{'a': 1}, {'a': 2}]
+
+
+def test_parse_merge_multiple_sources():
+    result = yamlconfig.parse_merge_multiple([b'a: 1\nb: 1\n', io.BytesIO(b'b: 2\n')])
+    assert result == {'a': 1, 'b': 2}
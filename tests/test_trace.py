@@ -0,0 +1,70 @@
+import os
+
+import click
+from click.testing import CliRunner
+
+import yamlconfig
+from yamlconfig import trace
+from yamlconfig.trace import Tracer
+from yamlconfig.click_type import YAMLConfig
+
+import testdata
+
+
+def test_trace_parse_config_file():
+    testfiles = testdata.get_data_files()
+    configfile = testfiles['linked_diamond_top']
+    received = []
+
+    with Tracer(callback=received.append) as tracer:
+        yamlconfig.parse_config_file(configfile, join_rootdir=True)
+
+    assert trace.active_tracer is None
+    assert received == tracer.records
+
+    reads = [rec for rec in tracer.records if rec.phase == 'read']
+    assert len(reads) == 4
+    assert reads[0].path == configfile
+    assert reads[0].nbytes == os.path.getsize(configfile)
+
+    depths = {
+        os.path.basename(rec.path): rec.depth
+        for rec in tracer.records if rec.phase == 'load'}
+    assert depths == {
+        'linked_diamond_top.yaml': 0,
+        'linked_diamond_left.yaml': 1,
+        'linked_diamond_right.yaml': 1,
+        'linked_diamond_base.yaml': 2}
+
+    summary = tracer.summary()
+    for phase in ['read', 'parse', 'join_rootdir', 'load', 'merge']:
+        assert summary[phase]['count'] > 0
+    assert summary['read']['nbytes'] == sum(rec.nbytes for rec in reads)
+
+
+def test_trace_parse_merge_multiple_cached():
+    testfiles = testdata.get_data_files()
+    infiles = [testfiles[k] for k in ['merge_multi1', 'merge_multi2']]
+    cache = yamlconfig.cache.ParseCache()
+    yamlconfig.parse_merge_multiple(infiles, cache=cache)
+
+    with Tracer() as tracer:
+        yamlconfig.parse_merge_multiple(infiles, cache=cache)
+
+    phases = [rec.phase for rec in tracer.records]
+    assert phases == ['copy', 'copy', 'merge']
+
+
+def test_trace_click_convert():
+    testfiles = testdata.get_data_files()
+
+    @click.command()
+    @click.option('--config', type=YAMLConfig())
+    def main(config):
+        click.echo(config['name'])
+
+    with Tracer() as tracer:
+        result = CliRunner().invoke(main, ['--config', testfiles['hello_world']])
+
+    assert result.exit_code == 0
+    assert [rec.phase for rec in tracer.records][-1] == 'convert'
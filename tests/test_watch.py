@@ -0,0 +1,78 @@
+import os
+import time
+
+import yamlconfig
+from yamlconfig import watch
+from yamlconfig.watch import ConfigWatcher
+
+import testdata
+
+
+def test_watcher_initial(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.DIAMOND_CONFIGS, mtime=1000)
+    watcher = ConfigWatcher(configfile)
+    assert watcher.config == yamlconfig.parse_config_file(configfile)
+    assert sorted(os.path.basename(f) for f in watcher.files) == [
+        'base.yaml', 'left.yaml', 'right.yaml', 'top.yaml']
+    assert watcher.poll() == []
+
+
+def test_watcher_reloads_changed_file_only(tmpdir, monkeypatch):
+    configfile = testdata.write_configs(tmpdir, testdata.DIAMOND_CONFIGS, mtime=1000)
+    watcher = ConfigWatcher(configfile)
+    notified = []
+    watcher.subscribe(lambda config, changed: notified.append(changed))
+
+    loaded = []
+    load_layer = watch._load_layer
+
+    def counting_load_layer(path, **kwargs):
+        loaded.append(os.path.basename(path))
+        return load_layer(path, **kwargs)
+
+    monkeypatch.setattr(watch, '_load_layer', counting_load_layer)
+
+    testdata.write_file(tmpdir.join('base.yaml'), 'name: base\nsection:\n  a: 2\n  b: 1\nnew: 1\n', 2000)
+    changed = watcher.poll()
+
+    assert loaded == ['base.yaml']
+    assert sorted(changed) == [('new',), ('section', 'a')]
+    assert notified == [changed]
+    assert watcher.config == yamlconfig.parse_config_file(configfile)
+
+
+def test_watcher_follows_new_linked_file(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.DIAMOND_CONFIGS, mtime=1000)
+    watcher = ConfigWatcher(configfile)
+    testdata.write_file(tmpdir.join('extra.yaml'), 'extra: 1\n', 1000)
+    testdata.write_file(tmpdir.join('right.yaml'), 'right: 1\nconfig_files: [extra.yaml]\n', 2000)
+
+    assert sorted(watcher.poll()) == [('extra',)]
+    assert watcher.config['extra'] == 1
+    assert 'base.yaml' in [os.path.basename(f) for f in watcher.files]
+
+
+def test_watcher_keeps_config_on_error(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.DIAMOND_CONFIGS, mtime=1000)
+    watcher = ConfigWatcher(configfile)
+    config = watcher.config
+    testdata.write_file(tmpdir.join('left.yaml'), 'left: [unclosed\n', 2000)
+
+    assert watcher.poll() == []
+    assert watcher.config is config
+
+
+def test_watcher_background(tmpdir):
+    configfile = testdata.write_configs(tmpdir, testdata.DIAMOND_CONFIGS, mtime=1000)
+    watcher = ConfigWatcher(configfile)
+    notified = []
+    watcher.subscribe(lambda config, changed: notified.append(changed))
+    watcher.start(interval=0.01)
+    try:
+        testdata.write_file(tmpdir.join('top.yaml'), 'name: changed\nconfig_files: [left.yaml, right.yaml]\n', 2000)
+        deadline = time.time() + 5
+        while not notified and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        watcher.stop()
+    assert notified == [[('name',)]]
@@ -19,3 +19,32 @@ def get_data_files():
         key = os.path.splitext(os.path.basename(fn))[0]
         filesdict[key] = fn
     return filesdict
+
+
+# config.yaml links linked.yaml
+LINKED_CONFIGS = [
+    ('linked.yaml', 'foo: linked\nbar: linked\n'),
+    ('config.yaml', 'foo: linking\nconfig_files:\n  - linked.yaml\n')]
+
+# top.yaml links left.yaml and right.yaml, which both link base.yaml
+DIAMOND_CONFIGS = [
+    ('base.yaml', 'name: base\nsection:\n  a: 1\n  b: 1\n'),
+    ('left.yaml', 'left: 1\nconfig_files: [base.yaml]\n'),
+    ('right.yaml', 'right: 1\nconfig_files: [base.yaml]\n'),
+    ('top.yaml', 'name: top\nconfig_files: [left.yaml, right.yaml]\n')]
+
+
+def write_file(path, text, mtime=None):
+    """Write text to path, optionally setting its modification time"""
+    with open(str(path), 'w') as fout:
+        fout.write(text)
+    if mtime is not None:
+        os.utime(str(path), (mtime, mtime))
+
+
+def write_configs(tmpdir, configs, mtime=None):
+    """Write (name, text) pairs to tmpdir and return path of the last file"""
+    for name, text in configs:
+        path = str(tmpdir.join(name))
+        write_file(path, text, mtime=mtime)
+    return path
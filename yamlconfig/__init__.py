@@ -1 +1,3 @@
+__version__ = '3.5'
+
 from yamlconfig.parse import *
@@ -0,0 +1,160 @@
+"""Asyncio counterparts of parse_config_file and parse_merge_multiple
+
+File reads, parsing and merging run on an executor so the event loop
+is never blocked. Requires Python 3.5+.
+"""
+import asyncio
+import functools
+
+from yamlconfig.parse import merge_multiple
+from yamlconfig.parse import _file_key
+from yamlconfig.parse import _load_layer
+from yamlconfig.parse import _build_include_graph
+from yamlconfig.parse import _resolve_include_graph
+
+
+async def _run(executor, semaphore, func, *args):
+    loop = asyncio.get_event_loop()
+    if semaphore is None:
+        return await loop.run_in_executor(executor, func, *args)
+    async with semaphore:
+        return await loop.run_in_executor(executor, func, *args)
+
+
+async def _load_include_graph(configfile, load_layer, merge_linked_files, executor, semaphore):
+    """Load every unique file in the include graph concurrently
+
+    Linked files are scheduled as soon as the file linking them is loaded.
+
+    Returns
+    -------
+    dict
+        file key -> (configdict, linked paths)
+    """
+    loaded = {}
+    tasks = {}
+    scheduled = set()
+
+    def schedule(path):
+        key = _file_key(path)
+        if key in scheduled:
+            return None
+        scheduled.add(key)
+        task = asyncio.ensure_future(_run(executor, semaphore, load_layer, path))
+        tasks[task] = key
+        return task
+
+    pending = set([schedule(configfile)])
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                configdict, linked = task.result()
+                loaded[tasks[task]] = (configdict, linked)
+                if not merge_linked_files:
+                    continue
+                for path in linked:
+                    child = schedule(path)
+                    if child is not None:
+                        pending.add(child)
+    finally:
+        # on error or cancellation, drop loads that are still queued
+        for task in tasks:
+            task.cancel()
+    return loaded
+
+
+async def parse_config_file_async(
+        configfile, join_rootdir=False, merge_linked_files=True,
+        round_trip=False, rootdir_kwargs={}, executor=None, max_concurrency=None):
+    """Parse YAML config file without blocking the event loop
+
+    Same result as parse_config_file. Linked files are
+    loaded concurrently on the executor.
+
+    Parameters
+    ----------
+    configfile : str
+        path to YAML config file
+    join_rootdir, merge_linked_files, round_trip, rootdir_kwargs
+        see parse_config_file
+    executor : concurrent.futures.Executor, optional
+        executor for reading, parsing and merging
+        default is the event loop's default executor
+    max_concurrency : int, optional
+        maximum number of files loaded at the same time
+
+    Returns
+    -------
+    dict-like
+        config dict
+
+    Raises
+    ------
+    LinkedConfigCycleError
+        if linked config files form a cycle
+    """
+    semaphore = None
+    if max_concurrency is not None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+    return await _parse_config_file(
+            configfile, executor, semaphore, join_rootdir=join_rootdir,
+            merge_linked_files=merge_linked_files, round_trip=round_trip,
+            rootdir_kwargs=rootdir_kwargs)
+
+
+async def _parse_config_file(
+        configfile, executor, semaphore, join_rootdir=False, merge_linked_files=True,
+        round_trip=False, rootdir_kwargs={}):
+    load_layer = functools.partial(
+            _load_layer, join_rootdir=join_rootdir,
+            round_trip=round_trip, rootdir_kwargs=rootdir_kwargs)
+    loaded = await _load_include_graph(
+            configfile, load_layer, merge_linked_files, executor, semaphore)
+
+    def resolve():
+        # files are loaded, only check for cycles and order them
+        nodes, order = _build_include_graph(
+                configfile, lambda path: loaded[_file_key(path)],
+                merge_linked_files=merge_linked_files)
+        return _resolve_include_graph(nodes, order)[order[-1]]
+
+    return await _run(executor, None, resolve)
+
+
+async def parse_merge_multiple_async(
+        configfiles, executor=None, max_concurrency=None, **kwargs):
+    """Parse and merge multiple config files without blocking the event loop
+
+    All files and their linked files are loaded concurrently.
+
+    Parameters
+    ----------
+    configfiles : list of str
+        list of config file paths
+    executor : concurrent.futures.Executor, optional
+        executor for reading, parsing and merging
+    max_concurrency : int, optional
+        maximum number of files loaded at the same time
+        (shared by all config files)
+    **kwargs : additional keyword arguments
+        join_rootdir, merge_linked_files, round_trip, rootdir_kwargs
+        see parse_config_file
+
+    Returns
+    -------
+    dict-like
+        merged config dict (last file rules)
+    """
+    semaphore = None
+    if max_concurrency is not None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [
+        asyncio.ensure_future(_parse_config_file(cfpath, executor, semaphore, **kwargs))
+        for cfpath in configfiles]
+    try:
+        configdicts = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return await _run(executor, None, merge_multiple, configdicts)
@@ -0,0 +1,177 @@
+"""Config bundles in zip and tar archives
+
+All YAML members are read in one pass over the archive and kept in memory,
+so the root config file and every linked file are parsed without
+extracting anything to disk.
+"""
+import os
+import posixpath
+import tarfile
+import zipfile
+import contextlib
+
+from yamlconfig.source import ConfigSource
+
+YAML_SUFFIXES = ('.yaml', '.yml')
+
+
+def _member_name(name):
+    name = posixpath.normpath(name.replace('\\', '/'))
+    return name.lstrip('/')
+
+
+class ConfigArchive(object):
+
+    def __init__(self, path, root=None, suffixes=YAML_SUFFIXES):
+        """Config files in zip or tar archive
+
+        Parameters
+        ----------
+        path : str
+            path to zip or tar archive
+            (tar may be gzip, bz2 or xz compressed)
+        root : str, optional
+            directory the archive members are treated as extracted to
+            rootdir of members and linked `config_files` are resolved
+            relative to it
+            default is the archive's directory
+        suffixes : tuple of str or None
+            only read members with these suffixes
+            None reads all files
+
+        Example
+        -------
+        >>> archive = ConfigArchive('bundle.zip')
+        >>> configdict = yamlconfig.parse_config_file(archive.source('main.yaml'))
+        """
+        self.path = path
+        if root is None:
+            root = os.path.dirname(os.path.abspath(path))
+        self.root = root
+        self.members = self._read(path, suffixes)
+
+    @staticmethod
+    def _read(path, suffixes):
+        members = {}
+
+        def _wanted(name):
+            return suffixes is None or name.lower().endswith(tuple(suffixes))
+
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    if info.filename.endswith('/') or not _wanted(info.filename):
+                        continue
+                    members[_member_name(info.filename)] = zf.read(info)
+        else:
+            # stream mode reads the archive front to back exactly once
+            with tarfile.open(path, 'r|*') as tf:
+                for info in tf:
+                    if not info.isfile() or not _wanted(info.name):
+                        continue
+                    members[_member_name(info.name)] = tf.extractfile(info).read()
+        return members
+
+    @property
+    def key(self):
+        return os.path.normcase(os.path.abspath(self.path))
+
+    def __contains__(self, member):
+        return _member_name(member) in self.members
+
+    def source(self, member=None):
+        """ArchiveSource for member
+
+        Parameters
+        ----------
+        member : str, optional
+            member name, e.g. 'configs/main.yaml'
+            default is the only YAML file at the top of the archive
+
+        Raises
+        ------
+        KeyError
+            if member is not in the archive
+        ValueError
+            if member is not given and there is not exactly
+            one YAML file at the top of the archive
+        """
+        if member is None:
+            top = sorted(name for name in self.members if '/' not in name)
+            if len(top) != 1:
+                raise ValueError(
+                        'Archive {} has {} top-level config files, specify member.'.format(
+                            self.path, len(top)))
+            member = top[0]
+        member = _member_name(member)
+        if member not in self.members:
+            raise KeyError('{} not in archive {}'.format(member, self.path))
+        return ArchiveSource(self, member)
+
+    def member_for_path(self, path):
+        """Member name of path under root, or None"""
+        relpath = os.path.relpath(os.path.abspath(path), os.path.abspath(self.root))
+        if relpath == os.pardir or relpath.startswith(os.pardir + os.sep):
+            return None
+        member = _member_name(relpath)
+        if member in self.members:
+            return member
+        return None
+
+
+class ArchiveSource(ConfigSource):
+
+    def __init__(self, archive, member):
+        """Config file in ConfigArchive
+
+        Use ConfigArchive.source to create.
+
+        basedir is the member's directory under the archive root.
+        Linked `config_files` that point to archive members
+        are read from the archive, others from the file system.
+        """
+        basedir = os.path.join(archive.root, *posixpath.dirname(member).split('/'))
+        name = '{}:{}'.format(archive.path, member)
+        super(ArchiveSource, self).__init__(name, basedir=os.path.normpath(basedir))
+        self.archive = archive
+        self.member = member
+
+    @property
+    def key(self):
+        return ('archive', self.archive.key, self.member)
+
+    @contextlib.contextmanager
+    def open(self):
+        yield self.archive.members[self.member]
+
+    def resolve_linked(self, path):
+        member = self.archive.member_for_path(path)
+        if member is None:
+            # archive directories may not exist on disk
+            return os.path.normpath(path)
+        return ArchiveSource(self.archive, member)
+
+
+def parse_archive(path, member=None, root=None, **kwargs):
+    """Parse config file in zip or tar archive
+
+    Parameters
+    ----------
+    path : str
+        path to archive
+    member : str, optional
+        root config file in the archive
+        default is the only YAML file at the top of the archive
+    root : str, optional
+        see ConfigArchive
+    **kwargs : additional keyword arguments
+        passed to yamlconfig.parse_config_file
+
+    Returns
+    -------
+    dict-like
+        config dict
+    """
+    from yamlconfig.parse import parse_config_file
+    archive = ConfigArchive(path, root=root)
+    return parse_config_file(archive.source(member), **kwargs)
@@ -0,0 +1,157 @@
+import os
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from collections import namedtuple
+
+from yamlconfig import trace
+from yamlconfig.source import as_source
+
+logger = logging.getLogger(__name__)
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'currsize', 'maxsize'])
+
+
+def file_stamp(path):
+    """Get (mtime, size) stamp of file
+
+    Parameters
+    ----------
+    path : str
+        path to file
+
+    Returns
+    -------
+    tuple
+        (mtime, size) or None if file does not exist
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    mtime = getattr(st, 'st_mtime_ns', st.st_mtime)
+    return (mtime, st.st_size)
+
+
+def _traced_copy(configdict, path):
+    tracer = trace.active_tracer
+    if tracer is None:
+        return copy.deepcopy(configdict)
+    start = trace.clock()
+    configdict = copy.deepcopy(configdict)
+    tracer.record('copy', path, start)
+    return configdict
+
+
+def options_key(**options):
+    """Make hashable key from parse options"""
+    return repr(sorted(options.items()))
+
+
+class ParseCache(object):
+
+    def __init__(self, maxsize=128):
+        """Stat-validated LRU cache for parsed config files
+
+        Entries are keyed on absolute path and parse options
+        and are only returned if the (mtime, size) stamps of the
+        config file and all linked config files are unchanged.
+
+        Parameters
+        ----------
+        maxsize : int
+            maximum number of entries
+            least recently used entries are evicted first
+        """
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive integer.')
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(configfile, **options):
+        """Cache key for config file (path or FileSource) and parse options"""
+        return (as_source(configfile).key, options_key(**options))
+
+    def get(self, key):
+        """Get copy of cached config dict
+
+        Parameters
+        ----------
+        key : tuple
+            cache key from make_key
+
+        Returns
+        -------
+        dict-like or None
+            copy of cached config dict
+            None if not cached or any file changed
+        """
+        with self._lock:
+            try:
+                stamps, configdict = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if any(file_stamp(path) != stamp for path, stamp in stamps):
+                logger.debug('Cache entry for \'%s\' is stale.', key[0])
+                del self._entries[key]
+                self.misses += 1
+                return None
+            # mark as most recently used
+            self._entries[key] = self._entries.pop(key)
+            self.hits += 1
+        return _traced_copy(configdict, key[0])
+
+    def put(self, key, configdict, files, stamps=None):
+        """Store copy of config dict
+
+        Parameters
+        ----------
+        key : tuple
+            cache key from make_key
+        configdict : dict-like
+            parsed config dict
+        files : list of str
+            config file and all linked config files
+        stamps : list of tuple, optional
+            file_stamp of each file, taken before it was read
+            default is to stat the files now, which caches
+            a file changed after it was read as up to date
+        """
+        if stamps is None:
+            stamps = [file_stamp(path) for path in files]
+        stamps = list(zip(files, stamps))
+        configdict = _traced_copy(configdict, key[0])
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (stamps, configdict)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def info(self):
+        """Get hits, misses, evictions and size"""
+        with self._lock:
+            return CacheInfo(
+                    self.hits, self.misses, self.evictions,
+                    len(self._entries), self.maxsize)
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+default_cache = ParseCache()
@@ -1,4 +1,7 @@
 CONFIGKEY = '__configkey'
+SETKEY = '__setkey'
+
+_MISSING = object()
 
 OPTION_DEFAULTS = dict(
         required=True,
@@ -8,16 +11,21 @@ OPTION_DEFAULTS = dict(
 def yaml_config_option(
         keys=None, allow_missing=False, multiple=True,
         drop_keys=None, join_rootdir=False, parse_kwargs={},
-        shortflag='-c', longflag='--config', **clickkwargs):
+        shortflag='-c', longflag='--config', deferred=False,
+        env_prefix=None, setflag=None, **clickkwargs):
     """Generate YAML config file option for click
 
     Parameters
     ----------
-    keys : list of hashable or list of (hashable, default_value)
+    keys : list of hashable or list of (hashable, default_value) or Schema or dict
         top-level keys
         single keys are required to be in YAML config
         tuples interpreted as optional where the second
         item is used as default value
+        dotted keys ('section.key') that are not top-level keys
+        select nested values, passed as 'section_key'
+        a schema (see yamlconfig.schema) is validated against
+        the merged config and its top-level keys are passed
     allow_missing : bool
         allow for missing keys
     multiple : bool
@@ -28,8 +36,18 @@ def yaml_config_option(
         short and long option flags
     join_rootdir : bool
         join paths with rootdir
+    deferred : bool
+        do not parse on argument processing, pass a single
+        DeferredConfig keyword argument (named after longflag)
+        that parses, merges and selects keys on first access
     parse_kwargs : dict, optional
         keyword arguments passed to yamlconfig.parse_config_file
+    env_prefix : str, optional
+        override config values with environment variables
+        starting with this prefix (see yamlconfig.overrides)
+    setflag : str, optional
+        add repeatable option (e.g. '--set') for key.path=value overrides
+        applied after environment variables
     **clickkwargs : additional keyword arguments
         passed to click.option
         e.g. `required` or `help`
@@ -42,46 +60,89 @@ def yaml_config_option(
     import click
     from yamlconfig import merge_multiple
     from yamlconfig.click_type import YAMLConfig
+    from yamlconfig.schema import Schema
+    from yamlconfig.lazy import DeferredConfig
+    from yamlconfig.overrides import build_overrides
+    from yamlconfig.overrides import apply_overrides
+
+    schema = None
+    if isinstance(keys, dict):
+        schema = Schema(keys)
+    elif isinstance(keys, Schema):
+        schema = keys
 
     if 'join_rootdir' not in parse_kwargs:
         parse_kwargs['join_rootdir'] = join_rootdir
 
-    yamltype = YAMLConfig(parse_kwargs=parse_kwargs)
+    yamltype = YAMLConfig(parse_kwargs=parse_kwargs, deferred=deferred)
+    deferred_name = longflag.lstrip('-').replace('-', '_')
 
     kw = OPTION_DEFAULTS.copy()
     kw.update(clickkwargs)
     yaml_option = click.option(
             shortflag, longflag, CONFIGKEY,
             multiple=multiple, type=yamltype, **kw)
+    set_option = None
+    if setflag is not None:
+        set_option = click.option(
+                setflag, SETKEY, multiple=True, metavar='KEY.PATH=VALUE',
+                help='Override config value (repeatable)')
 
     def wrap_maker(f):
 
-        @functools.wraps(f)
-        def wrapped(*args, **kwargs):
-            config = kwargs.pop(CONFIGKEY)
+        def select(config, set_items=()):
             if multiple:
                 if not isinstance(config, tuple):
                     raise ValueError('Something went wrong.')
-                config = merge_multiple(config)
+                config = merge_multiple(
+                        [c.resolve() if isinstance(c, DeferredConfig) else c for c in config])
+            elif isinstance(config, DeferredConfig):
+                config = config.resolve()
+
+            # environment keys are matched against the merged config
+            overrides = build_overrides(
+                    env_prefix=env_prefix, set_items=set_items, config=config)
+            config = apply_overrides(config, overrides)
 
-            if keys is not None:
+            if schema is not None:
+                # raises SchemaError (a ValueError) listing all errors
+                schema.validate(config)
+                return dict((k, config[k]) for k in schema.keys if k in config)
+            elif keys is not None:
                 # subset config
                 config_sub = {}
                 for k in keys:
                     if isinstance(k, (list, tuple)) and len(k) == 2:
-                        config_sub[k[0]] = config.get(k[0], k[1])
+                        name, value = _lookup(config, k[0], default=k[1])
+                        config_sub[name] = value
                         continue
                     try:
-                        config_sub[k] = config[k]
+                        name, value = _lookup(config, k)
+                        config_sub[name] = value
                     except KeyError:
                         if allow_missing:
                             continue
                         else:
                             raise ValueError(
                                     'Config file(s) are missing required key \'{}\'.'.format(k))
-                kwargs.update(config_sub)
-            else:
-                kwargs.update(config)
+                return config_sub
+            return config
+
+        def select_deferred(config, set_items):
+            config = dict(select(config, set_items))
+            for key in drop_keys or []:
+                config.pop(key, None)
+            return config
+
+        @functools.wraps(f)
+        def wrapped(*args, **kwargs):
+            config = kwargs.pop(CONFIGKEY)
+            set_items = kwargs.pop(SETKEY, ())
+            if deferred:
+                kwargs[deferred_name] = DeferredConfig(lambda: select_deferred(config, set_items))
+                return f(*args, **kwargs)
+
+            kwargs.update(select(config, set_items))
 
             if drop_keys:
                 for key in drop_keys:
@@ -89,6 +150,23 @@ def yaml_config_option(
 
             return f(*args, **kwargs)
 
+        if set_option is not None:
+            wrapped = set_option(wrapped)
         return yaml_option(wrapped)
 
     return wrap_maker
+
+
+def _lookup(config, key, default=_MISSING):
+    """Keyword argument name and value for (possibly dotted) key"""
+    if key in config:
+        return key, config[key]
+    if isinstance(key, str) and '.' in key:
+        from yamlconfig.index import get_path
+        name = key.replace('.', '_')
+        if default is _MISSING:
+            return name, get_path(config, key)
+        return name, get_path(config, key, default=default)
+    if default is _MISSING:
+        raise KeyError(key)
+    return key, default
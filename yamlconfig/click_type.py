@@ -1,36 +1,63 @@
+import os
+
 import click
 
+from yamlconfig import trace
 from yamlconfig import parse_config_file
 from yamlconfig.postproc import check_required_keys
 from yamlconfig.postproc import RequiredKeysError
+from yamlconfig.schema import Schema
+from yamlconfig.lazy import DeferredConfig
 
 
 class YAMLConfig(click.ParamType):
 
     name = 'yamlconfig'
 
-    def __init__(self, required_keys=None, squeeze=False, join_rootdir=False, parse_kwargs={}):
+    def __init__(
+            self, required_keys=None, squeeze=False, join_rootdir=False, parse_kwargs={},
+            deferred=False):
         """YAML config file to dict
 
         Parameters
         ----------
-        required_keys : list of str
+        required_keys : list of str or Schema or dict
             keys that must be in the top level of the config dict
             or the squeezed level
+            or nested schema (see yamlconfig.schema)
         squeeze : bool
             squeeze single-key top level from config dict
         join_rootdir : bool
             join paths with rootdir
         parse_kwargs : dict
             keyword arguments passed to yamlconfig.parse_config_file
+        deferred : bool
+            only check that the file exists and return a DeferredConfig
+            that parses and checks on first access
+            errors are then raised as click.BadParameter on access
         """
+        if isinstance(required_keys, dict):
+            required_keys = Schema(required_keys)
         self.required_keys = required_keys
         self.squeeze = squeeze
         if 'join_rootdir' not in parse_kwargs:
             parse_kwargs['join_rootdir'] = join_rootdir
         self.parse_kwargs = parse_kwargs
+        self.deferred = deferred
 
     def convert(self, value, param, ctx):
+        if isinstance(value, DeferredConfig):
+            return value
+        if self.deferred:
+            if not os.path.isfile(value):
+                self.fail('Config file \'{}\' does not exist.'.format(value), param, ctx)
+            return DeferredConfig(lambda: self._load(value, param, ctx))
+        return self._load(value, param, ctx)
+
+    def _load(self, value, param, ctx):
+        tracer = trace.active_tracer
+        if tracer is not None:
+            start = trace.clock()
         try:
             configkw = parse_config_file(value, **self.parse_kwargs)
         except IOError as exc:
@@ -43,4 +70,6 @@ class YAMLConfig(click.ParamType):
             check_required_keys(configkw, required_keys=self.required_keys)
         except RequiredKeysError as exc:
             self.fail(str(exc), param, ctx)
+        if tracer is not None:
+            tracer.record('convert', value, start)
         return configkw
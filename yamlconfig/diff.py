@@ -0,0 +1,147 @@
+from collections import namedtuple
+
+from yamlconfig.merge import new_like
+from yamlconfig.parse import _dict_types
+
+ConfigDiff = namedtuple('ConfigDiff', ['added', 'changed', 'removed'])
+
+
+def _cached_node(fingerprint, value):
+    """Cache node of ConfigFingerprint for value, filled if needed"""
+    if fingerprint is None:
+        return None
+    if fingerprint.config is not value:
+        raise ValueError('Fingerprint does not belong to config dict.')
+    # computes digests once, reuses them afterwards
+    fingerprint.digest
+    return fingerprint._root
+
+
+def _same_digest(base_node, target_node, base, target):
+    return (
+        base_node is not None and target_node is not None and
+        base_node.obj_id == id(base) and target_node.obj_id == id(target) and
+        base_node.digest is not None and base_node.digest == target_node.digest)
+
+
+def diff_configs(base, target, base_fingerprint=None, target_fingerprint=None):
+    """Key paths added, changed and removed from base to target
+
+    Mappings are compared key by key, everything else
+    (including lists) by equality. Subtrees that are the same object,
+    or have the same cached digest, are skipped, so the cost
+    depends on the size of the change, not on the size of the config.
+
+    Parameters
+    ----------
+    base, target : dict-like
+        config dicts
+    base_fingerprint, target_fingerprint : ConfigFingerprint, optional
+        fingerprints of base and target
+        (see yamlconfig.fingerprint) whose cached
+        subtree digests are used to skip identical subtrees
+
+    Returns
+    -------
+    ConfigDiff
+        added, changed and removed key paths (tuples of keys)
+        a mapping replaced by a non-mapping (or vice versa)
+        is a changed path, not compared further
+    """
+    added = []
+    changed = []
+    removed = []
+    stack = [(
+        base, target, (),
+        _cached_node(base_fingerprint, base),
+        _cached_node(target_fingerprint, target))]
+    while stack:
+        base, target, prefix, base_node, target_node = stack.pop()
+        if base is target or _same_digest(base_node, target_node, base, target):
+            continue
+        for key in base:
+            path = prefix + (key,)
+            if key not in target:
+                removed.append(path)
+                continue
+            old = base[key]
+            new = target[key]
+            if old is new:
+                continue
+            if isinstance(old, _dict_types) and isinstance(new, _dict_types):
+                stack.append((
+                    old, new, path,
+                    base_node.children.get(key) if base_node is not None else None,
+                    target_node.children.get(key) if target_node is not None else None))
+            elif (isinstance(old, _dict_types) or isinstance(new, _dict_types) or
+                    old != new):
+                changed.append(path)
+        for key in target:
+            if key not in base:
+                added.append(prefix + (key,))
+    return ConfigDiff(added, changed, removed)
+
+
+def make_overlay(base, target, ignore_unrepresentable=False, diff=None, **fingerprints):
+    """Minimal overlay that turns base into target
+
+    update_recursive_plain(base, overlay) makes base equal to target.
+    Overlay values are shared with target, not copied.
+
+    Parameters
+    ----------
+    base, target : dict-like
+        config dicts
+    ignore_unrepresentable : bool
+        skip changes an overlay cannot express
+        (removed keys and mappings replaced by non-mappings)
+        instead of raising ValueError
+    diff : ConfigDiff, optional
+        diff_configs(base, target) if already computed
+    **fingerprints
+        base_fingerprint, target_fingerprint
+        passed to diff_configs
+
+    Returns
+    -------
+    dict-like
+        overlay of the same type as target
+
+    Raises
+    ------
+    ValueError
+        if the change cannot be expressed as overlay
+        and ignore_unrepresentable is not set
+    """
+    if diff is None:
+        diff = diff_configs(base, target, **fingerprints)
+
+    unrepresentable = list(diff.removed)
+    for path in diff.changed:
+        if isinstance(_get(base, path), _dict_types):
+            unrepresentable.append(path)
+    if unrepresentable and not ignore_unrepresentable:
+        raise ValueError(
+                'Changes cannot be expressed as overlay: {}'.format(
+                    ', '.join('.'.join(str(k) for k in path) for path in unrepresentable)))
+
+    skip = set(unrepresentable)
+    overlay = new_like(target)
+    for path in diff.added + diff.changed:
+        if path in skip:
+            continue
+        sub = overlay
+        sub_target = target
+        for key in path[:-1]:
+            sub_target = sub_target[key]
+            if key not in sub:
+                sub[key] = new_like(sub_target)
+            sub = sub[key]
+        sub[path[-1]] = sub_target[path[-1]]
+    return overlay
+
+
+def _get(configdict, path):
+    for key in path:
+        configdict = configdict[key]
+    return configdict
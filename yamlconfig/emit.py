@@ -0,0 +1,141 @@
+"""Streaming YAML emission for large config dicts
+
+ruamel.yaml represents the whole config dict as a node graph before
+emitting it. Here plain dicts and lists are turned into YAML events
+one item at a time, so memory does not grow with the size of the config.
+"""
+
+
+def dump_streaming(configdict, stream, Dumper, default_flow_style=None, **kwargs):
+    """Dump config dict to stream without building a node graph
+
+    Output is the same as ruamel.yaml.dump with the given Dumper,
+    except that repeated objects are written out in full
+    instead of as anchors and aliases.
+
+    Parameters
+    ----------
+    configdict : dict-like
+        config dict
+    stream : file-like
+        text stream to write to
+    Dumper : type
+        safe ruamel.yaml dumper class (pure or C)
+    default_flow_style : bool or None
+        as for ruamel.yaml.dump
+    **kwargs : additional keyword arguments
+        passed to Dumper
+    """
+    from ruamel.yaml import events
+
+    dumper = Dumper(stream, default_flow_style=default_flow_style, **kwargs)
+    emitter = _EventEmitter(dumper, default_flow_style)
+    try:
+        dumper.emit(events.StreamStartEvent(encoding=kwargs.get('encoding')))
+        dumper.emit(events.DocumentStartEvent(
+            explicit=kwargs.get('explicit_start'),
+            version=kwargs.get('version'), tags=kwargs.get('tags')))
+        emitter.emit_value(configdict)
+        dumper.emit(events.DocumentEndEvent(explicit=kwargs.get('explicit_end')))
+        dumper.emit(events.StreamEndEvent())
+    finally:
+        dumper.dispose()
+
+
+class _EventEmitter(object):
+
+    def __init__(self, dumper, default_flow_style):
+        from ruamel.yaml import events
+        from ruamel.yaml import nodes
+        self.dumper = dumper
+        self.default_flow_style = default_flow_style
+        self.events = events
+        self.nodes = nodes
+        self.sort_keys = getattr(dumper, 'sort_base_mapping_type_on_output', True)
+
+    def represent(self, value):
+        dumper = self.dumper
+        node = dumper.represent_data(value)
+        # the representer keeps every object for alias detection
+        dumper.represented_objects = {}
+        dumper.object_keeper = []
+        dumper.alias_key = None
+        return node
+
+    def is_plain(self, value):
+        """Whether value is represented as plain scalar"""
+        if type(value) in (dict, list):
+            return False
+        node = self.represent(value)
+        return isinstance(node, self.nodes.ScalarNode) and not node.style
+
+    def flow_style(self, values):
+        if self.default_flow_style is not None:
+            return self.default_flow_style
+        return all(self.is_plain(value) for value in values)
+
+    def emit_value(self, value):
+        # only exact dicts and lists are streamed, everything else
+        # (OrderedDict, tuple, custom types) is represented as usual
+        if type(value) is dict:
+            self.emit_dict(value)
+        elif type(value) is list:
+            self.emit_list(value)
+        else:
+            self.emit_node(self.represent(value))
+
+    def emit_dict(self, value):
+        events = self.events
+        items = list(value.items())
+        if self.sort_keys:
+            try:
+                items = sorted(items)
+            except TypeError:
+                pass
+        if self.default_flow_style is not None:
+            flow_style = self.default_flow_style
+        else:
+            flow_style = all(self.is_plain(k) and self.is_plain(v) for k, v in items)
+        self.dumper.emit(events.MappingStartEvent(
+            None, u'tag:yaml.org,2002:map', True, flow_style=flow_style, nr_items=len(items)))
+        for key, item in items:
+            self.emit_node(self.represent(key))
+            self.emit_value(item)
+        self.dumper.emit(events.MappingEndEvent())
+
+    def emit_list(self, value):
+        events = self.events
+        self.dumper.emit(events.SequenceStartEvent(
+            None, u'tag:yaml.org,2002:seq', True, flow_style=self.flow_style(value)))
+        for item in value:
+            self.emit_value(item)
+        self.dumper.emit(events.SequenceEndEvent())
+
+    def emit_node(self, node):
+        """Emit events of represented node (same as the serializer)"""
+        events = self.events
+        nodes = self.nodes
+        dumper = self.dumper
+        if isinstance(node, nodes.ScalarNode):
+            detected_tag = dumper.resolve(nodes.ScalarNode, node.value, (True, False))
+            default_tag = dumper.resolve(nodes.ScalarNode, node.value, (False, True))
+            implicit = (
+                node.tag == detected_tag,
+                node.tag == default_tag,
+                node.tag.startswith('tag:yaml.org,2002:'))
+            dumper.emit(events.ScalarEvent(None, node.tag, implicit, node.value, style=node.style))
+        elif isinstance(node, nodes.SequenceNode):
+            implicit = node.tag == dumper.resolve(nodes.SequenceNode, node.value, True)
+            dumper.emit(events.SequenceStartEvent(
+                None, node.tag, implicit, flow_style=node.flow_style))
+            for item in node.value:
+                self.emit_node(item)
+            dumper.emit(events.SequenceEndEvent())
+        else:
+            implicit = node.tag == dumper.resolve(nodes.MappingNode, node.value, True)
+            dumper.emit(events.MappingStartEvent(
+                None, node.tag, implicit, flow_style=node.flow_style, nr_items=len(node.value)))
+            for key, item in node.value:
+                self.emit_node(key)
+                self.emit_node(item)
+            dumper.emit(events.MappingEndEvent())
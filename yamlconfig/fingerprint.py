@@ -0,0 +1,165 @@
+import hashlib
+import binascii
+
+from yamlconfig.parse import _dict_types
+
+
+def _hash(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+def _scalar_digest(value):
+    text = u'{}:{!r}'.format(type(value).__name__, value)
+    return _hash(b's', text.encode('utf-8'))
+
+
+class _Node(object):
+    """Cached digest of a container and its child containers"""
+
+    __slots__ = ('obj_id', 'digest', 'children')
+
+    def __init__(self, obj_id):
+        self.obj_id = obj_id
+        self.digest = None
+        self.children = {}
+
+
+def _digest(value, node):
+    """Digest of value, reusing and filling the cache in node
+
+    Returns
+    -------
+    bytes
+        digest
+    _Node or None
+        cache node for containers
+    """
+    is_dict = isinstance(value, _dict_types)
+    if not is_dict and not isinstance(value, (list, tuple)):
+        return _scalar_digest(value), None
+
+    if node is None or node.obj_id != id(value):
+        node = _Node(id(value))
+    elif node.digest is not None:
+        return node.digest, node
+
+    children = {}
+    if is_dict:
+        # sorted by key digest to make digest independent of key order
+        pairs = []
+        for key in value:
+            child_digest, child_node = _digest(value[key], node.children.get(key))
+            if child_node is not None:
+                children[key] = child_node
+            pairs.append(_scalar_digest(key) + child_digest)
+        pairs.sort()
+        node.digest = _hash(b'm', *pairs)
+    else:
+        items = []
+        for i, item in enumerate(value):
+            child_digest, child_node = _digest(item, node.children.get(i))
+            if child_node is not None:
+                children[i] = child_node
+            items.append(child_digest)
+        node.digest = _hash(b'l', *items)
+    node.children = children
+    return node.digest, node
+
+
+def fingerprint(configdict):
+    """Stable content fingerprint of config dict
+
+    Mappings are compared independent of key order,
+    lists dependent on item order. Scalars must have the same
+    type and repr to compare equal.
+
+    Parameters
+    ----------
+    configdict : dict-like
+        config dict
+
+    Returns
+    -------
+    str
+        hex digest
+    """
+    digest, _ = _digest(configdict, None)
+    return binascii.hexlify(digest).decode('ascii')
+
+
+class ConfigFingerprint(object):
+
+    def __init__(self, configdict):
+        """Fingerprint of config dict with cached subtree digests
+
+        After changing the config dict, pass the changed key paths
+        to `invalidate` (or the MergeStats returned by
+        update_recursive with key_paths=True to `update`)
+        and only those paths are hashed again.
+
+        Parameters
+        ----------
+        configdict : dict-like
+            config dict
+        """
+        self.config = configdict
+        self._root = None
+
+    @property
+    def digest(self):
+        """Hex digest of current config dict, see fingerprint"""
+        digest, self._root = _digest(self.config, self._root)
+        return binascii.hexlify(digest).decode('ascii')
+
+    def subtree_digest(self, path):
+        """Hex digest of subtree at key path"""
+        value = self.config
+        node = self._root
+        for key in path:
+            value = value[key]
+            node = node.children.get(key) if node is not None else None
+        digest, _ = _digest(value, node)
+        return binascii.hexlify(digest).decode('ascii')
+
+    def invalidate(self, paths):
+        """Drop cached digests along changed key paths
+
+        Parameters
+        ----------
+        paths : iterable of tuple
+            changed key paths
+        """
+        for path in paths:
+            node = self._root
+            if not path:
+                self._root = None
+                continue
+            for key in path[:-1]:
+                if node is None:
+                    break
+                node.digest = None
+                node = node.children.get(key)
+            if node is not None:
+                node.digest = None
+                node.children.pop(path[-1], None)
+
+    def update(self, stats):
+        """Invalidate paths changed by update_recursive
+
+        Parameters
+        ----------
+        stats : MergeStats
+            as returned by update_recursive with key_paths=True
+
+        Returns
+        -------
+        str
+            new hex digest
+        """
+        if stats.paths is None:
+            raise ValueError('Pass key_paths=True to update_recursive to get changed paths.')
+        self.invalidate(stats.paths)
+        return self.digest
@@ -0,0 +1,148 @@
+import sys
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from yamlconfig.parse import _dict_types
+
+try:
+    _intern = sys.intern
+except AttributeError:
+    # Python 2
+    _intern = intern  # noqa: F821
+
+
+class FrozenConfig(Mapping):
+    """Immutable, hashable config mapping
+
+    Keys and values are stored in two tuples.
+    Larger mappings get a key index for constant-time lookup.
+    """
+
+    __slots__ = ('_keys', '_values', '_index', '_hash')
+
+    index_threshold = 8
+
+    def __init__(self, items=()):
+        keys = []
+        values = []
+        for key, value in items:
+            keys.append(key)
+            values.append(value)
+        self._keys = tuple(keys)
+        self._values = tuple(values)
+        if len(keys) > self.index_threshold:
+            self._index = dict((key, i) for i, key in enumerate(keys))
+        else:
+            self._index = None
+        self._hash = None
+
+    def __getitem__(self, key):
+        try:
+            if self._index is not None:
+                return self._values[self._index[key]]
+            return self._values[self._keys.index(key)]
+        except (KeyError, ValueError):
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if self._index is not None:
+            return key in self._index
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(zip(self._keys, self._values)))
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenConfig):
+            if self._keys == other._keys and self._values == other._values:
+                return True
+        return Mapping.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return (self.__class__, (tuple(zip(self._keys, self._values)),))
+
+    def __repr__(self):
+        return '{}({{{}}})'.format(
+            self.__class__.__name__,
+            ', '.join('{!r}: {!r}'.format(k, v) for k, v in zip(self._keys, self._values)))
+
+
+def _freeze_str(value):
+    try:
+        return _intern(value)
+    except TypeError:
+        # unicode on Python 2
+        return value
+
+
+def freeze(value):
+    """Convert config dict to immutable FrozenConfig
+
+    Mappings become FrozenConfig, lists and tuples become tuples,
+    sets become frozensets and strings are interned.
+    Comments and formatting of ruamel types are dropped.
+
+    Parameters
+    ----------
+    value : dict-like
+        config dict (or any value in it)
+
+    Returns
+    -------
+    FrozenConfig
+        hashable, immutable config
+    """
+    if isinstance(value, FrozenConfig):
+        return value
+    if isinstance(value, _dict_types):
+        return FrozenConfig(
+            (_freeze_str(key) if isinstance(key, str) else key, freeze(value[key]))
+            for key in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    if isinstance(value, str):
+        return _freeze_str(value)
+    return value
+
+
+def thaw(value, dict_type=dict):
+    """Convert FrozenConfig back to mutable config dict
+
+    Parameters
+    ----------
+    value : FrozenConfig
+        frozen config (or any value in it)
+    dict_type : type
+        mapping type to use
+
+    Returns
+    -------
+    dict_type
+        config dict with lists instead of tuples
+    """
+    if isinstance(value, FrozenConfig):
+        out = dict_type()
+        for key, item in zip(value._keys, value._values):
+            out[key] = thaw(item, dict_type=dict_type)
+        return out
+    if isinstance(value, tuple):
+        return [thaw(item, dict_type=dict_type) for item in value]
+    if isinstance(value, frozenset):
+        return set(thaw(item, dict_type=dict_type) for item in value)
+    return value
@@ -0,0 +1,232 @@
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from yamlconfig.merge import new_like
+from yamlconfig.parse import _dict_types
+from yamlconfig.parse import update_recursive
+
+_MISSING = object()
+
+
+def split_path(path):
+    """Key path as tuple
+
+    Parameters
+    ----------
+    path : str or tuple
+        dotted key path ('a.b.c') or tuple of keys
+
+    Returns
+    -------
+    tuple
+        keys
+    """
+    if isinstance(path, tuple):
+        return path
+    if isinstance(path, list):
+        return tuple(path)
+    return tuple(path.split('.'))
+
+
+def get_path(configdict, path, default=_MISSING):
+    """Get value at key path in nested config dict
+
+    Parameters
+    ----------
+    configdict : dict-like
+        config dict
+    path : str or tuple
+        dotted key path or tuple of keys
+    default : optional
+        returned if path does not exist
+        default is to raise KeyError
+
+    Returns
+    -------
+    value at path
+    """
+    value = configdict
+    try:
+        for key in split_path(path):
+            value = value[key]
+    except (KeyError, TypeError, IndexError):
+        if default is _MISSING:
+            raise KeyError(path)
+        return default
+    return value
+
+
+def set_path(configdict, path, value):
+    """Set value at key path in nested config dict, IN-PLACE!
+
+    Missing intermediate mappings are created with the type
+    (and format) of their parent.
+
+    Parameters
+    ----------
+    configdict : dict-like
+        config dict
+    path : str or tuple
+        dotted key path or tuple of keys
+    value
+        value to set
+
+    Raises
+    ------
+    KeyError
+        if an intermediate value is not a mapping
+    """
+    keys = split_path(path)
+    parent = configdict
+    for key in keys[:-1]:
+        if key not in parent:
+            parent[key] = new_like(parent)
+        parent = parent[key]
+        if not isinstance(parent, _dict_types):
+            raise KeyError(path)
+    parent[keys[-1]] = value
+
+
+class ConfigIndex(Mapping):
+
+    def __init__(self, configdict):
+        """Flat index of all key paths in nested config dict
+
+        Maps key paths to their parent mapping and key,
+        so deep lookups cost two dict lookups regardless of depth.
+        Values changed in place in their parent mapping are seen
+        without re-indexing. After structural changes (keys added,
+        deleted or mappings replaced), pass the changed key paths to
+        `reindex`, or use `set` and `update_recursive` of the index.
+
+        Parameters
+        ----------
+        configdict : dict-like
+            config dict
+
+        Example
+        -------
+        >>> index = ConfigIndex({'processing': {'bands': {'red': {'scale': 2}}}})
+        >>> index['processing.bands.red.scale']
+        2
+        """
+        self.config = configdict
+        self._parents = {}
+        self._children = {}
+        self._split = {}
+        self._add(configdict, ())
+
+    def _key(self, path):
+        if isinstance(path, tuple):
+            return path
+        try:
+            return self._split[path]
+        except (KeyError, TypeError):
+            pass
+        keys = split_path(path)
+        if isinstance(path, str):
+            self._split[path] = keys
+        return keys
+
+    def _add(self, container, prefix):
+        """Index mapping at prefix and everything below it"""
+        stack = [(container, prefix)]
+        while stack:
+            container, prefix = stack.pop()
+            keys = list(container)
+            self._children[prefix] = keys
+            for key in keys:
+                path = prefix + (key,)
+                self._parents[path] = (container, key)
+                value = container[key]
+                if isinstance(value, _dict_types):
+                    stack.append((value, path))
+
+    def _remove(self, prefix):
+        """Drop index entries at prefix and below it"""
+        stack = [prefix]
+        while stack:
+            path = stack.pop()
+            self._parents.pop(path, None)
+            for key in self._children.pop(path, ()):
+                stack.append(path + (key,))
+
+    def __getitem__(self, path):
+        try:
+            container, key = self._parents[self._key(path)]
+        except KeyError:
+            raise KeyError(path)
+        return container[key]
+
+    def __contains__(self, path):
+        return self._key(path) in self._parents
+
+    def __iter__(self):
+        return iter(self._parents)
+
+    def __len__(self):
+        return len(self._parents)
+
+    def parent(self, path):
+        """Parent mapping and key of key path"""
+        try:
+            return self._parents[self._key(path)]
+        except KeyError:
+            raise KeyError(path)
+
+    def reindex(self, paths):
+        """Re-index changed key paths
+
+        Parameters
+        ----------
+        paths : iterable of str or tuple
+            key paths that were added, replaced or deleted
+            e.g. MergeStats.paths returned by update_recursive
+            with key_paths=True
+        """
+        for path in paths:
+            path = self._key(path)
+            self._remove(path)
+            parent_path = path[:-1]
+            if parent_path:
+                if parent_path not in self._parents:
+                    continue
+                container = self[parent_path]
+            else:
+                container = self.config
+            key = path[-1]
+            if key not in container:
+                if parent_path in self._children:
+                    self._children[parent_path] = [k for k in self._children[parent_path] if k != key]
+                continue
+            siblings = self._children.setdefault(parent_path, [])
+            if key not in siblings:
+                siblings.append(key)
+            self._parents[path] = (container, key)
+            if isinstance(container[key], _dict_types):
+                self._add(container[key], path)
+
+    def set(self, path, value):
+        """Set value at key path and update the index"""
+        keys = self._key(path)
+        created = None
+        for i in range(1, len(keys)):
+            if keys[:i] not in self._parents:
+                created = keys[:i]
+                break
+        set_path(self.config, keys, value)
+        self.reindex([created if created is not None else keys])
+
+    def update_recursive(self, subset, **kwargs):
+        """Apply update_recursive to the config dict and update the index
+
+        Returns
+        -------
+        MergeStats
+            as returned by update_recursive
+        """
+        stats = update_recursive(self.config, subset, key_paths=True, **kwargs)
+        self.reindex(stats.paths)
+        return stats
@@ -0,0 +1,509 @@
+import os
+import codecs
+from collections import OrderedDict
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+from yamlconfig import rootdir_logic
+from yamlconfig.parse import _yaml
+from yamlconfig.parse import _use_c_backend
+from yamlconfig.parse import _c_backend_classes
+from yamlconfig.parse import _build_include_graph
+from yamlconfig.source import as_source
+
+
+class _NotIndexable(Exception):
+    """Document cannot be split into independent source slices"""
+
+
+_NOT_BUILT = object()
+
+
+class _Entry(object):
+    """Value of a key in a layer, kept as source slice or node until built"""
+
+    __slots__ = ('is_mapping', 'flow', 'start', 'column', 'end', 'node', 'built')
+
+    def __init__(self, is_mapping, flow=False, start=None, column=None, end=None, node=None):
+        self.is_mapping = is_mapping
+        self.flow = flow
+        self.start = start
+        self.column = column
+        self.end = end
+        self.node = node
+        self.built = _NOT_BUILT
+
+
+def _scalar_key(loader, event):
+    from ruamel.yaml.nodes import ScalarNode
+    tag = event.tag
+    if tag is None or tag == u'!':
+        tag = loader.resolve(ScalarNode, event.value, event.implicit)
+    return loader.construct_document(ScalarNode(tag, event.value, style=event.style))
+
+
+def _index_mapping(text, loader_cls, start=0, end=None, column=0, depth=1):
+    """Index block mapping in text[start:end] without composing nodes
+
+    The mapping is the document at depth 1, or the value of the
+    single key of the slice at depth 2.
+    Only the start and end index of each key-value pair is kept.
+
+    Returns
+    -------
+    OrderedDict or None
+        key -> _Entry with absolute indices into text
+        None if the document is empty
+
+    Raises
+    ------
+    _NotIndexable
+        if the document uses anchors, aliases, merge keys,
+        complex keys or tag directives
+    ValueError
+        if the document is not a mapping
+    """
+    from ruamel.yaml import events
+    if end is None:
+        chunk = text[start:]
+    else:
+        chunk = text[start:end]
+    offset = start - column
+    chunk = u' ' * column + chunk
+    loader = loader_cls(chunk)
+    entries = OrderedDict()
+    try:
+        level = 0
+        key = _NOT_BUILT
+        key_mark = None
+        value_start = None
+        found = False
+        outer_key = False
+        while loader.check_event():
+            event = loader.get_event()
+            if isinstance(event, events.AliasEvent) or getattr(event, 'anchor', None) is not None:
+                raise _NotIndexable()
+            if isinstance(event, events.DocumentStartEvent):
+                if found:
+                    raise ValueError('Expected a single document in config.')
+                if event.tags:
+                    raise _NotIndexable()
+                continue
+            if isinstance(event, (events.MappingEndEvent, events.SequenceEndEvent)):
+                level -= 1
+                if level == depth and value_start is not None:
+                    entries[key].end = event.end_mark.index + offset
+                    key = _NOT_BUILT
+                    value_start = None
+                continue
+            if not isinstance(event, (
+                    events.ScalarEvent, events.MappingStartEvent, events.SequenceStartEvent)):
+                continue
+            if level == depth - 1:
+                if depth == 2 and not outer_key:
+                    # single key of the slice
+                    outer_key = True
+                    continue
+                found = True
+                if not isinstance(event, events.MappingStartEvent):
+                    if depth == 1 and isinstance(event, events.ScalarEvent) and event.value == u'' \
+                            and event.implicit[0]:
+                        # empty document
+                        return None
+                    raise ValueError('Config must be a mapping.')
+            elif level == depth:
+                if key is _NOT_BUILT:
+                    # mapping key
+                    if not isinstance(event, events.ScalarEvent) or (
+                            event.value == u'<<' and event.implicit[0]):
+                        raise _NotIndexable()
+                    key_mark = event.start_mark
+                    if chunk[key_mark.index - key_mark.column:key_mark.index].strip():
+                        # e.g. explicit '? key', the slice would not start at the key
+                        raise _NotIndexable()
+                    key = _scalar_key(loader, event)
+                else:
+                    # value
+                    is_mapping = isinstance(event, events.MappingStartEvent)
+                    entries[key] = _Entry(
+                            is_mapping, flow=is_mapping and bool(event.flow_style),
+                            start=key_mark.index + offset, column=key_mark.column)
+                    if isinstance(event, events.ScalarEvent):
+                        entries[key].end = event.end_mark.index + offset
+                        key = _NOT_BUILT
+                    else:
+                        value_start = event.start_mark
+            if isinstance(event, (events.MappingStartEvent, events.SequenceStartEvent)):
+                level += 1
+    finally:
+        loader.dispose()
+    if not found:
+        return None
+    return entries
+
+
+class _Layer(object):
+    """Keys of a single config file (or nested mapping in it)
+
+    Values are kept as slices of the decoded source text
+    and parsed on first access. Documents that cannot be sliced
+    (anchors, aliases, merge keys) are composed into nodes instead.
+    Either way, the slice or node is dropped once the value is built.
+    """
+
+    __slots__ = ('entries', 'text', 'loader_cls', 'loader', 'rootdir', 'default_rootdir', 'matcher')
+
+    def __init__(self, entries, text, loader_cls, loader, rootdir, default_rootdir, matcher):
+        self.entries = entries
+        self.text = text
+        self.loader_cls = loader_cls
+        self.loader = loader
+        self.rootdir = rootdir
+        self.default_rootdir = default_rootdir
+        self.matcher = matcher
+
+    @classmethod
+    def from_text(cls, text, loader_cls, default_rootdir, matcher, **index_kwargs):
+        try:
+            entries = _index_mapping(text, loader_cls, **index_kwargs)
+        except _NotIndexable:
+            start = index_kwargs.get('start', 0)
+            end = index_kwargs.get('end')
+            column = index_kwargs.get('column', 0)
+            chunk = u' ' * column + (text[start:] if end is None else text[start:end])
+            node = _compose(chunk, loader_cls)
+            if index_kwargs.get('depth', 1) == 2:
+                node = node.value[0][1]
+            return cls.from_node(node, loader_cls(u''), default_rootdir, matcher)
+        layer = cls(entries or OrderedDict(), text, loader_cls, None, None, default_rootdir, matcher)
+        return layer._init_rootdir()
+
+    @classmethod
+    def from_node(cls, node, loader, default_rootdir, matcher):
+        from ruamel.yaml.nodes import MappingNode
+        entries = OrderedDict()
+        if node is not None:
+            if not isinstance(node, MappingNode):
+                raise ValueError('Config must be a mapping, got {}.'.format(node.tag))
+            loader.flatten_mapping(node)
+            for key_node, value_node in node.value:
+                entries[loader.construct_document(key_node)] = _Entry(
+                        isinstance(value_node, MappingNode), node=value_node)
+        layer = cls(entries, None, None, loader, None, default_rootdir, matcher)
+        return layer._init_rootdir()
+
+    def _init_rootdir(self):
+        self.rootdir = self.default_rootdir
+        if 'rootdir' in self.entries:
+            self.rootdir = self._construct(self.entries['rootdir'])
+        if self.rootdir is None:
+            # nothing to join, not even in nested mappings
+            self.matcher = None
+        return self
+
+    def _construct(self, entry):
+        if entry.node is not None:
+            return self.loader.construct_document(entry.node)
+        chunk = u' ' * entry.column + self.text[entry.start:entry.end]
+        loader = self.loader_cls(chunk)
+        try:
+            data = loader.get_single_data()
+        finally:
+            loader.dispose()
+        return next(iter(data.values()))
+
+    def is_mapping(self, key):
+        return self.entries[key].is_mapping
+
+    def value(self, key):
+        """Constructed value of key, joined with rootdir"""
+        entry = self.entries[key]
+        if entry.built is _NOT_BUILT:
+            value = self._construct(entry)
+            if self.matcher is not None and self.matcher(key):
+                value = rootdir_logic.join_value(self.rootdir, value)
+            entry.built = value
+            entry.node = None
+        return entry.built
+
+    def child(self, key):
+        """Layer of mapping value of key"""
+        entry = self.entries[key]
+        if entry.built is _NOT_BUILT:
+            if entry.node is not None:
+                child = self.from_node(entry.node, self.loader, self.default_rootdir, self.matcher)
+            elif entry.flow:
+                # flow mappings are small, compose them
+                chunk = u' ' * entry.column + self.text[entry.start:entry.end]
+                node = _compose(chunk, self.loader_cls).value[0][1]
+                child = self.from_node(
+                        node, self.loader_cls(u''), self.default_rootdir, self.matcher)
+            else:
+                child = self.from_text(
+                        self.text, self.loader_cls, self.default_rootdir, self.matcher,
+                        start=entry.start, end=entry.end, column=entry.column, depth=2)
+            entry.built = child
+            entry.node = None
+        return entry.built
+
+    def without(self, key):
+        """Copy without key, sharing the entries"""
+        entries = OrderedDict((k, v) for k, v in self.entries.items() if k != key)
+        return self.__class__(
+                entries, self.text, self.loader_cls, self.loader,
+                self.rootdir, self.default_rootdir, self.matcher)
+
+
+def _compose(text, loader_cls):
+    loader = loader_cls(text)
+    try:
+        return loader.get_single_node()
+    finally:
+        loader.dispose()
+
+
+class LazyConfig(Mapping):
+
+    def __init__(self, layers):
+        """Read-only config mapping built on first access
+
+        Values are parsed from their YAML source (and joined
+        with rootdir) only when accessed. Nested mappings are
+        LazyConfig instances themselves.
+
+        Parameters
+        ----------
+        layers : list of _Layer
+            layers to merge, last layer rules for values
+        """
+        self._layers = layers
+        keys = OrderedDict()
+        for layer in layers:
+            for key in layer.entries:
+                keys[key] = None
+        self._keys = list(keys)
+        self._values = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        found = [layer for layer in self._layers if key in layer.entries]
+        if not found:
+            raise KeyError(key)
+        return self._values.setdefault(key, self._build(key, found))
+
+    def _build(self, key, layers):
+        # same semantics as update_recursive:
+        # a mapping is only ever updated, not replaced by a later non-mapping
+        for i, layer in enumerate(layers):
+            if layer.is_mapping(key):
+                break
+        else:
+            return layers[-1].value(key)
+        return self.__class__([
+            layer.child(key) for layer in layers[i:] if layer.is_mapping(key)])
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return any(key in layer.entries for layer in self._layers)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, self._keys)
+
+    @property
+    def accessed(self):
+        """Keys whose values have been built so far"""
+        return [key for key in self._keys if key in self._values]
+
+    def materialize(self, dict_type=dict):
+        """Build all values and return a plain config dict"""
+        out = dict_type()
+        for key in self:
+            value = self[key]
+            if isinstance(value, LazyConfig):
+                value = value.materialize(dict_type=dict_type)
+            out[key] = value
+        return out
+
+
+def _read_text(source):
+    """Decoded YAML text of source"""
+    with source.open() as fin:
+        data = fin.read() if hasattr(fin, 'read') else fin
+    if isinstance(data, bytes):
+        if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            data = data.decode('utf-16')
+        else:
+            data = data.decode('utf-8')
+    if data.startswith(u'\ufeff'):
+        data = data[1:]
+    return data
+
+
+def _load_layer(configfile, matcher, backend):
+    if _use_c_backend(backend):
+        loader_cls = _c_backend_classes()[0]
+    else:
+        loader_cls = _yaml().SafeLoader
+    source = as_source(configfile)
+    text = _read_text(source)
+    layer = _Layer.from_text(text, loader_cls, source.basedir, matcher)
+
+    rootdir = layer.rootdir
+    linked = []
+    if 'config_files' in layer.entries:
+        for cf in layer.value('config_files') or []:
+            if rootdir is not None:
+                cf = os.path.join(rootdir, cf)
+            linked.append(source.resolve_linked(cf))
+        layer = layer.without('config_files')
+    return layer, linked
+
+
+def _dedupe(layers):
+    """Drop repeated layers except for their first and last occurrence"""
+    first = {}
+    last = {}
+    for i, layer in enumerate(layers):
+        first.setdefault(id(layer), i)
+        last[id(layer)] = i
+    return [
+        layer for i, layer in enumerate(layers)
+        if first[id(layer)] == i or last[id(layer)] == i]
+
+
+def parse_lazy(
+        configfile, join_rootdir=False, merge_linked_files=True,
+        rootdir_kwargs={}, backend='auto'):
+    """Parse YAML config file into LazyConfig
+
+    Only the top-level keys are indexed up front. Each value is kept
+    as its slice of the YAML text and only parsed and joined with
+    rootdir when it is accessed.
+
+    Parameters
+    ----------
+    configfile : str, bytes, mmap.mmap, file-like or ConfigSource
+        path to YAML config file or YAML source
+        see yamlconfig.source.as_source
+    join_rootdir : bool
+        join paths with rootdir
+        if `rootdir` is not in configfile, use its basedir
+    merge_linked_files : bool
+        merge other config files listed under `config_files`
+    rootdir_kwargs : dict
+        regex, exclude or matcher
+        as passed to join_paths_with_rootdir
+    backend : str
+        'auto', 'c' or 'pure'
+        see plain_parse_yaml
+
+    Returns
+    -------
+    LazyConfig
+        read-only config mapping
+    """
+    matcher = None
+    if join_rootdir or rootdir_kwargs:
+        matcher = rootdir_kwargs.get('matcher')
+        if matcher is None:
+            matcher = rootdir_logic.get_matcher(
+                    rootdir_kwargs.get('regex', rootdir_logic.default_key_regex),
+                    rootdir_kwargs.get('exclude'))
+
+    def load_layer(path):
+        return _load_layer(path, matcher=matcher, backend=backend)
+
+    nodes, order = _build_include_graph(
+            configfile, load_layer, merge_linked_files=merge_linked_files)
+
+    # same layering as parse._merge_linked, flattened
+    flat = {}
+    hidden_rootdir = {}
+    for key in order:
+        _, layer, children = nodes[key]
+        layers = [layer]
+        for child in children[::-1]:
+            for child_layer in flat[child]:
+                if 'rootdir' in child_layer.entries:
+                    try:
+                        child_layer = hidden_rootdir[id(child_layer)]
+                    except KeyError:
+                        child_layer = hidden_rootdir[id(child_layer)] = child_layer.without('rootdir')
+                layers.append(child_layer)
+        layers.append(layer)
+        flat[key] = _dedupe(layers)
+    return LazyConfig(flat[order[-1]])
+
+
+def merge_lazy(configs):
+    """Merge multiple LazyConfigs without building them
+
+    Parameters
+    ----------
+    configs : iterable of LazyConfig
+        configs to merge (last rules)
+
+    Returns
+    -------
+    LazyConfig
+        merged config
+    """
+    layers = []
+    for config in configs:
+        layers += config._layers
+    return LazyConfig(_dedupe(layers))
+
+
+class DeferredConfig(Mapping):
+
+    def __init__(self, load):
+        """Read-only config mapping loaded on first access
+
+        Parameters
+        ----------
+        load : callable
+            called without arguments on first access,
+            returns the config dict
+        """
+        self._load = load
+        self._config = None
+
+    @property
+    def loaded(self):
+        """Whether the config has been loaded"""
+        return self._config is not None
+
+    def resolve(self):
+        """Load (once) and return the underlying config dict"""
+        if self._config is None:
+            self._config = self._load()
+            self._load = None
+        return self._config
+
+    def __getitem__(self, key):
+        return self.resolve()[key]
+
+    def __iter__(self):
+        return iter(self.resolve())
+
+    def __len__(self):
+        return len(self.resolve())
+
+    def __contains__(self, key):
+        return key in self.resolve()
+
+    def __repr__(self):
+        if self._config is None:
+            return '{}(<not loaded>)'.format(self.__class__.__name__)
+        return '{}({!r})'.format(self.__class__.__name__, self._config)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+# ruamel.yaml CommentedMap is an OrderedDict subclass
+_dict_types = (dict, OrderedDict)
+
+
+def merge_layered(configdicts):
+    """Merge config dicts in a single pass without copying
+
+    Same semantics as applying update_recursive_plain to a copy
+    of the first config dict with each of the others in turn,
+    but no input is modified and nothing is deep-copied.
+
+    Parameters
+    ----------
+    configdicts : iterable of dicts
+        config dicts to merge (can be iterator)
+
+    Returns
+    -------
+    dict-like
+        merged config dict
+        last dict rules for values
+        first dict rules for format (if ruamel type)
+        subtrees that come from a single input are shared
+        with that input, not copied
+    """
+    layers = list(configdicts)
+    if not layers:
+        return None
+    return _merge_values(layers)
+
+
+def _merge_values(values):
+    """Merge values found under the same key, in order
+
+    As with update_recursive, a dict is only ever updated
+    and not replaced by a later non-dict value.
+    """
+    for i, value in enumerate(values):
+        if isinstance(value, _dict_types):
+            break
+    else:
+        return values[-1]
+    dicts = [value for value in values[i:] if isinstance(value, _dict_types)]
+    if len(dicts) == 1:
+        return dicts[0]
+    return _merge_dicts(dicts)
+
+
+def _merge_dicts(dicts):
+    keys = []
+    values = {}
+    for d in dicts:
+        for key in d:
+            try:
+                values[key].append(d[key])
+            except KeyError:
+                keys.append(key)
+                values[key] = [d[key]]
+
+    merged = new_like(dicts[0])
+    for key in keys:
+        merged[key] = _merge_values(values[key])
+    return merged
+
+
+def new_like(d):
+    """Create empty dict of same type and format as d"""
+    new = d.__class__()
+    # CommentedMap, checked without importing ruamel.yaml
+    if hasattr(d, 'copy_attributes'):
+        d.copy_attributes(new)
+    return new
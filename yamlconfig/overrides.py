@@ -0,0 +1,213 @@
+import os
+
+from yamlconfig.parse import _dict_types
+from yamlconfig.merge import merge_layered
+
+ENV_SEPARATOR = '__'
+
+
+def parse_value(text):
+    """Coerce override string to typed value
+
+    YAML scalar rules apply: '2' is an int, '2.5' a float,
+    'true' a bool and 'null' None. Flow sequences ('[a, b]')
+    become lists. Anything else, including text that YAML would
+    read as a mapping or block sequence ('foo: bar', '- a'),
+    stays a string.
+    """
+    from yamlconfig.parse import _yaml
+    try:
+        value = _yaml().safe_load(text)
+    except Exception:
+        return text
+    if isinstance(value, _dict_types):
+        return text
+    if isinstance(value, list) and not text.lstrip().startswith('['):
+        return text
+    return value
+
+
+def _match_key(mapping, key):
+    """Key of mapping equal to key ignoring case, or key lower-cased"""
+    if mapping is not None:
+        if key in mapping:
+            return key
+        lowered = key.lower()
+        matches = [k for k in mapping if isinstance(k, str) and k.lower() == lowered]
+        if len(matches) == 1:
+            return matches[0]
+    return key.lower()
+
+
+def env_overrides(prefix, environ=None, config=None):
+    """Overrides from environment variables starting with prefix
+
+    The rest of the variable name is split into nested keys
+    at double underscores, e.g. with prefix 'MYAPP_',
+    MYAPP_PROCESSING__SCALE=2 gives {'processing': {'scale': 2}}.
+    Keys are matched case-insensitively against the keys of config,
+    so MYAPP_INPUTFILE overrides `inputFile`. Keys not in config
+    are lower-cased.
+
+    Parameters
+    ----------
+    prefix : str
+        variable name prefix
+    environ : dict, optional
+        environment, default is os.environ
+    config : dict-like, optional
+        config dict to match keys against
+
+    Returns
+    -------
+    dict
+        nested overrides
+    """
+    if environ is None:
+        environ = os.environ
+    overrides = {}
+    # sorted for a deterministic result on conflicting names
+    for name in sorted(environ):
+        if not name.startswith(prefix) or len(name) == len(prefix):
+            continue
+        path = []
+        mapping = config
+        for key in name[len(prefix):].split(ENV_SEPARATOR):
+            key = _match_key(mapping, key)
+            path.append(key)
+            mapping = mapping.get(key) if mapping is not None else None
+            if not isinstance(mapping, _dict_types):
+                mapping = None
+        _set_override(overrides, path, parse_value(environ[name]))
+    return overrides
+
+
+def _parse_set_item(item):
+    path, sep, value = item.partition('=')
+    path = path.strip()
+    if not sep or not path:
+        raise ValueError('Override must be key.path=value, got \'{}\'.'.format(item))
+    return path.split('.'), parse_value(value)
+
+
+def set_overrides(items, overrides=None):
+    """Overrides from 'key.path=value' strings
+
+    Items are applied in order and later items win,
+    replacing earlier values (including whole mappings:
+    ['a.b=2', 'a=1'] gives {'a': 1}, ['a=1', 'a.b=2'] {'a': {'b': 2}}).
+
+    Parameters
+    ----------
+    items : iterable of str
+        e.g. ['processing.scale=2', 'name=run1']
+    overrides : dict, optional
+        earlier overrides to apply items to IN-PLACE
+
+    Returns
+    -------
+    dict
+        nested overrides
+
+    Raises
+    ------
+    ValueError
+        if an item has no '=' or an empty key
+    """
+    if overrides is None:
+        overrides = {}
+    for item in items:
+        path, value = _parse_set_item(item)
+        _set_override(overrides, path, value)
+    return overrides
+
+
+def _set_override(overrides, path, value):
+    """Set value at path, replacing non-mappings on the way"""
+    parent = overrides
+    for key in path[:-1]:
+        child = parent.get(key)
+        if not isinstance(child, dict):
+            child = parent[key] = {}
+        parent = child
+    parent[path[-1]] = value
+
+
+def build_overrides(env_prefix=None, set_items=(), environ=None, config=None):
+    """Combine environment and key=value overrides
+
+    Environment variables are applied first, then the key=value
+    items in order, each replacing earlier values at the same key
+    path (see set_overrides).
+
+    Parameters
+    ----------
+    env_prefix : str, optional
+        see env_overrides
+    set_items : iterable of str
+        see set_overrides
+    environ : dict, optional
+        environment, default is os.environ
+    config : dict-like, optional
+        config dict to match environment keys against
+
+    Returns
+    -------
+    dict
+        nested overrides, empty if there are none
+    """
+    overrides = {}
+    if env_prefix is not None:
+        overrides = env_overrides(env_prefix, environ=environ, config=config)
+    return set_overrides(set_items, overrides=overrides)
+
+
+def check_applied(configdict, overrides):
+    """Raise ValueError if overrides were not applied to configdict
+
+    Merging never replaces a mapping with another value,
+    so an override that does is reported instead of dropped.
+    """
+    stack = [(configdict, overrides, ())]
+    while stack:
+        merged, sub, prefix = stack.pop()
+        for key, value in sub.items():
+            path = prefix + (key,)
+            target = merged.get(key)
+            if isinstance(value, dict):
+                if isinstance(target, _dict_types):
+                    stack.append((target, value, path))
+            elif isinstance(target, _dict_types):
+                raise ValueError(
+                        'Override {}={!r} cannot replace a mapping.'.format(
+                            '.'.join(str(k) for k in path), value))
+
+
+def apply_overrides(configdict, overrides):
+    """Merge overrides onto config dict as final layer
+
+    Same semantics as update_recursive_plain, but configdict
+    is not modified and untouched subtrees are shared, not copied.
+
+    Parameters
+    ----------
+    configdict : dict-like
+        config dict
+    overrides : dict
+        nested overrides
+
+    Returns
+    -------
+    dict-like
+        new config dict (configdict itself if there are no overrides)
+
+    Raises
+    ------
+    ValueError
+        if an override would replace a mapping with another value
+    """
+    if not overrides:
+        return configdict
+    merged = merge_layered([configdict, overrides])
+    check_applied(merged, overrides)
+    return merged
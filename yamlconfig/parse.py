@@ -1,48 +1,188 @@
 import os.path
-import copy
 import logging
+import binascii
+import itertools
 from collections import OrderedDict
-
-import ruamel.yaml
+from collections import namedtuple
 
 from yamlconfig import rootdir_logic
+from yamlconfig import trace
+from yamlconfig.merge import merge_layered
+from yamlconfig.cache import default_cache
+from yamlconfig.cache import file_stamp
+from yamlconfig.source import as_source
+from yamlconfig.source import BufferSource
 
 logger = logging.getLogger(__name__)
 
-_ruamel_type = ruamel.yaml.comments.CommentedMap
-_dict_types = (dict, OrderedDict, _ruamel_type)
+# ruamel.yaml CommentedMap is an OrderedDict subclass
+_dict_types = (dict, OrderedDict)
+
+YAML_BACKENDS = ('auto', 'c', 'pure')
+
+_c_classes = None
+
+_MISSING = object()
+
+
+def _yaml():
+    """ruamel.yaml, imported on first use to keep `import yamlconfig` fast"""
+    import ruamel.yaml
+    return ruamel.yaml
+
+
+def _c_backend_classes():
+    """CSafeLoader and CSafeDumper (None if unavailable), imported on first use"""
+    global _c_classes
+    if _c_classes is None:
+        try:
+            from ruamel.yaml.cyaml import CSafeLoader
+            from ruamel.yaml.cyaml import CSafeDumper
+        except ImportError:
+            CSafeLoader = CSafeDumper = None
+        _c_classes = (CSafeLoader, CSafeDumper)
+    return _c_classes
+
+
+def has_c_backend():
+    """Whether the libyaml-based C loader and dumper are available"""
+    return _c_backend_classes()[0] is not None
+
+
+def _use_c_backend(backend):
+    if backend not in YAML_BACKENDS:
+        raise ValueError('backend must be one of {}, got {!r}.'.format(YAML_BACKENDS, backend))
+    if backend == 'c' and not has_c_backend():
+        raise ValueError('C backend requested but ruamel.yaml was built without libyaml.')
+    return backend != 'pure' and has_c_backend()
 
 
-def plain_parse_yaml(configfile, round_trip=False):
+def plain_parse_yaml(configfile, round_trip=False, backend='auto'):
     """Parse YAML config file
 
     Parameters
     ----------
-    configfile : str
-        path to YAML file
+    configfile : str, bytes, mmap.mmap, file-like or ConfigSource
+        path to YAML file or YAML source
+        see yamlconfig.source.as_source
     round_trip : bool
         use round-trip loader (preserves comments and spacing)
+    backend : str
+        'auto', 'c' or 'pure'
+        loader for non-round-trip mode
+        'auto' uses the libyaml C loader if available
+        round-trip mode is always pure Python
     """
-    with open(configfile, 'r') as fin:
+    use_c = _use_c_backend(backend)
+    source = as_source(configfile)
+    tracer = trace.active_tracer
+    with source.open() as fin:
+        stream = fin
+        if tracer is not None:
+            start = trace.clock()
+            if not isinstance(source, BufferSource):
+                # read up front to time reading and parsing separately
+                # (some sources, e.g. archive members, are already bytes)
+                if hasattr(fin, 'read'):
+                    stream = fin.read()
+                if source.is_file:
+                    nbytes = os.fstat(fin.fileno()).st_size
+                else:
+                    nbytes = len(stream)
+                tracer.record('read', source.name, start, nbytes=nbytes)
+                start = trace.clock()
+        yaml = _yaml()
         if round_trip:
-            return ruamel.yaml.round_trip_load(fin)
+            configdict = yaml.round_trip_load(stream)
+        elif use_c:
+            configdict = yaml.load(stream, Loader=_c_backend_classes()[0])
         else:
-            return ruamel.yaml.safe_load(fin)
+            configdict = yaml.safe_load(stream)
+    if tracer is not None:
+        tracer.record('parse', source.name, start)
+    return configdict
+
+
+def iter_parse_yaml(
+        configfile, round_trip=False, backend='auto',
+        join_rootdir=False, rootdir_kwargs={}, base=None, basedir=None):
+    """Parse multi-document YAML file one document at a time
+
+    Documents are read from the file as they are consumed,
+    so memory does not depend on the number of documents.
+
+    Parameters
+    ----------
+    configfile : str, bytes, mmap.mmap, file-like or ConfigSource
+        path to YAML file or YAML source
+        see yamlconfig.source.as_source
+    round_trip : bool
+        use round-trip loader (preserves comments and spacing)
+    backend : str
+        'auto', 'c' or 'pure'
+        see plain_parse_yaml
+    join_rootdir : bool
+        join paths in each document with rootdir
+        if `rootdir` is not in the document, use basedir
+    rootdir_kwargs : dict
+        keyword arguments passed
+        to join_paths_with_rootdir
+    base : dict-like, optional
+        merge each document onto this config dict
+        (document rules)
+        untouched subtrees of base are shared, not copied
+    basedir : str, optional
+        base directory for rootdir
+        default is the config file dir
+
+    Yields
+    ------
+    dict-like or None
+        config dict per document
+        None for empty documents
+        (a new config dict merged from base if base is given)
+    """
+    use_c = _use_c_backend(backend)
+    source = as_source(configfile, basedir=basedir)
+    with source.open() as fin:
+        yaml = _yaml()
+        if round_trip:
+            documents = yaml.round_trip_load_all(fin)
+        elif use_c:
+            documents = yaml.load_all(fin, Loader=_c_backend_classes()[0])
+        else:
+            documents = yaml.safe_load_all(fin)
+        for configdict in documents:
+            if configdict is None:
+                # empty document, e.g. '---\n---'
+                if base is not None:
+                    # new top-level dict so the caller's base is never yielded
+                    configdict = merge_layered([base, {}])
+                yield configdict
+                continue
+            if join_rootdir or rootdir_kwargs:
+                rootdir_logic.join_paths_with_rootdir(
+                        configdict, default_rootdir=source.basedir,
+                        **rootdir_kwargs)
+            if base is not None:
+                configdict = merge_layered([base, configdict])
+            yield configdict
 
 
 def parse_config_file(
         configfile, join_rootdir=False,
         merge_linked_files=True, round_trip=False,
-        rootdir_kwargs={}):
+        rootdir_kwargs={}, cache=None, sidecar_dir=None, lazy=False, basedir=None):
     """Parse YAML config file
 
     Parameters
     ----------
-    configfile : str
-        path to YAML config file
+    configfile : str, bytes, mmap.mmap, file-like or ConfigSource
+        path to YAML config file or YAML source
+        see yamlconfig.source.as_source
     join_rootdir : bool
         join paths with rootdir
-        if `rootdir` is not in configfile, use configfile dir
+        if `rootdir` is not in configfile, use basedir
     merge_linked_files : bool
         merge other config files listed under `config_files`
     round_trip : bool
@@ -50,47 +190,317 @@ def parse_config_file(
     rootdir_kwargs : dict
         keyword arguments passed
         to join_paths_with_rootdir
+    cache : bool or yamlconfig.cache.ParseCache, optional
+        cache parsed config dicts
+        entries are invalidated when the config file
+        or any of the linked files change
+        True uses yamlconfig.cache.default_cache
+    sidecar_dir : str, optional
+        directory for compiled sidecar files
+        the parsed config dict is pickled there and reused
+        as long as the config file and all linked files are unchanged
+        (only use directories you trust)
+    lazy : bool
+        return read-only yamlconfig.lazy.LazyConfig
+        whose values are only built (and joined with rootdir)
+        when accessed
+        cannot be combined with round_trip, cache or sidecar_dir
+    basedir : str, optional
+        base directory for rootdir and relative linked files
+        default is the config file dir
+        (current working directory for in-memory sources)
+
+    Notes
+    -----
+    cache and sidecar_dir only apply to config files,
+    they are ignored for in-memory and stream sources
+    """
+    source = as_source(configfile, basedir=basedir)
+    if lazy:
+        # an empty ParseCache is falsy, so compare explicitly
+        if round_trip or (cache is not None and cache is not False) or sidecar_dir is not None:
+            raise ValueError('lazy cannot be combined with round_trip, cache or sidecar_dir.')
+        from yamlconfig.lazy import parse_lazy
+        return parse_lazy(
+                source, join_rootdir=join_rootdir,
+                merge_linked_files=merge_linked_files,
+                rootdir_kwargs=rootdir_kwargs)
+
+    parse_kwargs = dict(
+            join_rootdir=join_rootdir,
+            merge_linked_files=merge_linked_files,
+            round_trip=round_trip,
+            rootdir_kwargs=rootdir_kwargs)
+
+    if cache is True:
+        cache = default_cache
+    elif cache is False or not source.is_file:
+        cache = None
+    if not source.is_file:
+        sidecar_dir = None
+
+    tracer = trace.active_tracer
+
+    # basedir changes rootdir and linked files, so it is part of the keys
+    key_kwargs = dict(parse_kwargs, basedir=source.basedir)
+
+    if cache is not None:
+        key = cache.make_key(source, **key_kwargs)
+        configdict = cache.get(key)
+        if configdict is not None:
+            return configdict
+
+    loaded = None
+    if sidecar_dir is not None:
+        # pickle, hashlib and tempfile are only needed here
+        from yamlconfig import sidecar
+        if tracer is not None:
+            start = trace.clock()
+        sidecar_file = sidecar.sidecar_path(sidecar_dir, source, **key_kwargs)
+        loaded = sidecar.load_sidecar(sidecar_file)
+        if tracer is not None:
+            tracer.record('sidecar', source.name, start)
+
+    prepare = None
+    if cache is not None or sidecar_dir is not None:
+        def prepare(source):
+            # stamp before reading, so a file changed while parsing
+            # invalidates the entry instead of being cached as current
+            stamp = file_stamp(source.path) if cache is not None else None
+            digest = None
+            if sidecar_dir is not None:
+                # hash exactly the bytes that are parsed
+                data, digest = sidecar.read_hashed(source.path)
+                source = BufferSource(data, basedir=source.basedir, name=source.name)
+            return (stamp, digest), source
+
+    stamps = None
+    if loaded is not None:
+        configdict, files, stamps = loaded
+    else:
+        configdict, files, tokens = _parse_config_tree(
+                source, prepare=prepare, **parse_kwargs)
+        if tokens is not None:
+            stamps = [stamp for stamp, _ in tokens]
+        if sidecar_dir is not None:
+            if tracer is not None:
+                start = trace.clock()
+            sidecar.write_sidecar(
+                    sidecar_file, configdict, files, [digest for _, digest in tokens])
+            if tracer is not None:
+                tracer.record('sidecar', source.name, start)
+
+    if cache is not None:
+        cache.put(key, configdict, files, stamps=stamps)
+    return configdict
+
+
+class LinkedConfigCycleError(ValueError):
+    pass
+
+
+def _file_key(configfile):
+    return as_source(configfile).key
+
+
+def _load_layer(configfile, join_rootdir, round_trip, rootdir_kwargs):
+    """Parse single config file without merging linked files
+
+    Returns
+    -------
+    dict-like
+        config dict without `config_files`
+    list of str or ConfigSource
+        linked config files
     """
-    configdict = plain_parse_yaml(configfile, round_trip=round_trip)
+    source = as_source(configfile)
+    # basedir is not needed for parsing
+    configdict = plain_parse_yaml(
+            source.path if source.is_file else source, round_trip=round_trip)
 
     if join_rootdir or rootdir_kwargs:
+        tracer = trace.active_tracer
+        if tracer is not None:
+            start = trace.clock()
         rootdir_logic.join_paths_with_rootdir(
-                configdict, default_rootdir=os.path.dirname(configfile), **rootdir_kwargs)
+                configdict, default_rootdir=source.basedir, **rootdir_kwargs)
+        if tracer is not None:
+            tracer.record('join_rootdir', source.name, start)
 
-    rootdir = configdict.get('rootdir', os.path.dirname(configfile))
+    rootdir = configdict.get('rootdir', source.basedir)
 
     # pop linked files
-    other_configfiles = configdict.pop('config_files', [])
+    other_configfiles = configdict.pop('config_files', None) or []
 
-    if merge_linked_files and other_configfiles:
-        configdict_rules = copy.deepcopy(configdict)
-        for cf in other_configfiles[::-1]:
-            if rootdir is not None:
-                cfpath = os.path.join(rootdir, cf)
-            else:
-                cfpath = cf
-            other_configdict = parse_config_file(
-                    cfpath,
-                    join_rootdir=join_rootdir,
-                    merge_linked_files=merge_linked_files,
-                    round_trip=round_trip,
-                    rootdir_kwargs=rootdir_kwargs)
-            other_configdict.pop('rootdir', None)
-            update_recursive_plain(configdict, other_configdict)
-
-        # make sure original config dict rules
-        update_recursive_plain(configdict, configdict_rules)
+    linked = []
+    for cf in other_configfiles:
+        if rootdir is not None:
+            cf = os.path.join(rootdir, cf)
+        linked.append(source.resolve_linked(cf))
+    return configdict, linked
 
-    return configdict
 
+def _build_include_graph(configfile, load_layer, merge_linked_files=True):
+    """Parse every unique file in the include graph exactly once
+
+    Parameters
+    ----------
+    configfile : str
+        path to root config file
+    load_layer : callable
+        path -> (configdict, linked paths)
+    merge_linked_files : bool
+        follow linked files
+
+    Returns
+    -------
+    dict
+        file key -> (path, configdict, list of linked file keys)
+    list
+        file keys in topological order (linked files first)
+    """
+    nodes = {}
+    order = []
+    tracer = trace.active_tracer
+
+    def _load(key, path, depth):
+        if tracer is not None:
+            start = trace.clock()
+        configdict, linked = load_layer(path)
+        if tracer is not None:
+            tracer.record('load', str(path), start, depth=depth)
+        if not merge_linked_files:
+            linked = []
+        children = [(_file_key(cfpath), cfpath) for cfpath in linked]
+        nodes[key] = (path, configdict, [ckey for ckey, _ in children])
+        return iter(children)
+
+    root = _file_key(configfile)
+    stack = [(root, _load(root, configfile, 0))]
+    on_stack = [root]
+    while stack:
+        key, children = stack[-1]
+        for child, cfpath in children:
+            if child in on_stack:
+                cycle = [str(nodes[k][0]) for k in on_stack[on_stack.index(child):]]
+                cycle.append(str(cfpath))
+                raise LinkedConfigCycleError(
+                        'Cycle in linked config files: {}'.format(' -> '.join(cycle)))
+            if child in nodes:
+                continue
+            stack.append((child, _load(child, cfpath, len(on_stack))))
+            on_stack.append(child)
+            break
+        else:
+            stack.pop()
+            on_stack.pop()
+            order.append(key)
+    return nodes, order
 
-def parse_merge_multiple(configfiles, **kwargs):
+
+def _merge_linked(configdict, linked_configdicts):
+    """Merge resolved linked config dicts with configdict
+
+    Earlier linked files take precedence over later ones
+    and configdict takes precedence over all of them.
+    Neither configdict nor the linked config dicts are modified.
+    """
+    if not linked_configdicts:
+        return configdict
+    layers = [configdict]
+    for other_configdict in linked_configdicts[::-1]:
+        if 'rootdir' in other_configdict:
+            other_configdict = OrderedDict(
+                    (k, v) for k, v in other_configdict.items() if k != 'rootdir')
+        layers.append(other_configdict)
+    # make sure original config dict rules
+    layers.append(configdict)
+    return merge_layered(layers)
+
+
+def _resolve_include_graph(nodes, order):
+    """Merge config dicts of include graph in topological order
+
+    Returns
+    -------
+    dict
+        file key -> resolved config dict
+    """
+    resolved = {}
+    tracer = trace.active_tracer
+    for key in order:
+        path, configdict, children = nodes[key]
+        if tracer is not None and children:
+            start = trace.clock()
+        resolved[key] = _merge_linked(configdict, [resolved[child] for child in children])
+        if tracer is not None and children:
+            tracer.record('merge', path, start)
+    return resolved
+
+
+def _parse_config_tree(
+        configfile, join_rootdir, merge_linked_files,
+        round_trip, rootdir_kwargs, prepare=None):
+    """Parse config file and linked files
+
+    Parameters
+    ----------
+    prepare : callable, optional
+        ConfigSource -> (token, ConfigSource to parse)
+        called for every file before it is read
+        e.g. to take the file stamp
+
+    Returns
+    -------
+    dict-like
+        config dict
+    list of str
+        paths of all parsed files
+    list
+        tokens returned by prepare, in the same order
+        (None without prepare)
+    """
+    tokens = {}
+
+    def load_layer(path):
+        if prepare is not None:
+            source = as_source(path)
+            tokens[source.key], path = prepare(source)
+        return _load_layer(
+                path, join_rootdir=join_rootdir,
+                round_trip=round_trip, rootdir_kwargs=rootdir_kwargs)
+
+    nodes, order = _build_include_graph(
+            configfile, load_layer, merge_linked_files=merge_linked_files)
+    resolved = _resolve_include_graph(nodes, order)
+    # str of FileSource is its path
+    files = [str(nodes[key][0]) for key in order]
+    if prepare is None:
+        return resolved[order[-1]], files, None
+    return resolved[order[-1]], files, [tokens[key] for key in order]
+
+
+def parse_merge_multiple(
+        configfiles, max_workers=None, pool='thread', overrides=None, **kwargs):
     """Parse and merge multiple config files
 
     Parameters
     ----------
-    configfiles : list of str
+    configfiles : list of str or YAML sources
         list of config file paths
+        (or bytes, mmap, file-like or ConfigSource)
+    max_workers : int, optional
+        parse files (and their linked files) concurrently
+        on this many workers
+        default is to parse files sequentially
+    pool : str
+        'thread' or 'process'
+        use thread pool (I/O bound, e.g. network file systems)
+        or process pool (CPU bound, large files)
+    overrides : dict, optional
+        nested values merged as final layer
+        see yamlconfig.overrides.build_overrides
+        ValueError is raised if one would replace a mapping
     **kwargs : additional keyword arguments
         passed to parse_config_file
 
@@ -98,12 +508,52 @@ def parse_merge_multiple(configfiles, **kwargs):
     -------
     dict-like
         merged config dict (last file rules)
+        yamlconfig.lazy.LazyConfig if `lazy` is set
     """
-    dd = (parse_config_file(cfpath, **kwargs) for cfpath in configfiles)
+    if kwargs.get('lazy'):
+        if overrides:
+            raise ValueError('overrides cannot be combined with lazy.')
+        from yamlconfig.lazy import merge_lazy
+        return merge_lazy(parse_config_file(cfpath, **kwargs) for cfpath in configfiles)
+
+    if max_workers is None:
+        dd = (parse_config_file(cfpath, **kwargs) for cfpath in configfiles)
+    else:
+        dd = _parse_concurrently(configfiles, max_workers=max_workers, pool=pool, **kwargs)
+    if overrides:
+        # merged in the same pass as the config files
+        dd = itertools.chain(dd, [overrides])
+    tracer = trace.active_tracer
+    if tracer is not None:
+        dd = list(dd)
+        start = trace.clock()
     configdict = merge_multiple(dd)
+    if tracer is not None:
+        tracer.record('merge', None, start)
+    if overrides:
+        from yamlconfig.overrides import check_applied
+        check_applied(configdict, overrides)
     return configdict
 
 
+def _parse_concurrently(configfiles, max_workers, pool, **kwargs):
+    """Parse config files on worker pool, in order"""
+    import functools
+    from concurrent import futures
+
+    try:
+        executor_cls = dict(
+                thread=futures.ThreadPoolExecutor,
+                process=futures.ProcessPoolExecutor)[pool]
+    except KeyError:
+        raise ValueError('pool must be \'thread\' or \'process\', got {!r}.'.format(pool))
+
+    parse = functools.partial(parse_config_file, **kwargs)
+    with executor_cls(max_workers=max_workers) as executor:
+        # map returns results in order of configfiles
+        return list(executor.map(parse, configfiles))
+
+
 def merge_multiple(configdicts):
     """Merge multiple config dicts
 
@@ -118,23 +568,22 @@ def merge_multiple(configdicts):
         merged config dicts
         last dict rules for values
         first dict rules for format (if ruamel type)
+        subtrees that come from a single input are shared
+        with that input, not copied
     """
-    cfd = None
-    for newcfd in configdicts:
-        if cfd is None:
-            cfd = copy.deepcopy(newcfd)
-        else:
-            update_recursive_plain(cfd, newcfd)
-    return cfd
+    return merge_layered(configdicts)
+
+
+MergeStats = namedtuple('MergeStats', ['added', 'overwritten', 'deleted', 'paths'])
 
 
 def update_recursive(template, subset,
-        ignore_notintemplate=True, delete_notinsubset=False):
+        ignore_notintemplate=True, delete_notinsubset=False, key_paths=False):
     """Update template with subset, recursively, IN-PLACE!
 
     Parameters
     ----------
-    template : mappable or _ruamel_type
+    template : mappable or CommentedMap
         template
         will be changed in-place!
     subset : mappable
@@ -145,23 +594,57 @@ def update_recursive(template, subset,
         delete keys from template that are not in subset
         i.e. the output will contain only the intersection between
         template and subset or only subset (if ignore_notintemplate is set)
+    key_paths : bool
+        collect key paths of changed keys in MergeStats.paths
+        (needed by ConfigFingerprint.update, costs about
+        as much as the update itself on large configs)
+
+    Returns
+    -------
+    MergeStats
+        number of keys added, overwritten and deleted
+        (at any level) and list of their key paths
+        (tuples of keys, None unless key_paths is set)
     """
     if not isinstance(template, _dict_types) or not isinstance(subset, _dict_types):
         return subset
 
-    for key in subset:
-        if key not in template and ignore_notintemplate:
-            continue
-        elif key in template and isinstance(template[key], _dict_types):
-            update_recursive(
-                    template=template[key],
-                    subset=subset[key],
-                    ignore_notintemplate=ignore_notintemplate,
-                    delete_notinsubset=delete_notinsubset)
-        else:
-            template[key] = subset[key]
-    if delete_notinsubset:
-        delete_keys_recursive(superset=template, subset=subset)
+    added = overwritten = deleted = 0
+    paths = [] if key_paths else None
+    # local names are faster in the loop
+    dict_types = _dict_types
+    missing = _MISSING
+    # explicit stack of (template, subset, key path) triples
+    # to support configs of any depth
+    stack = [(template, subset, ())]
+    while stack:
+        template, subset, prefix = stack.pop()
+        for key, value in subset.items():
+            current = template.get(key, missing)
+            if current is missing:
+                if ignore_notintemplate:
+                    continue
+                template[key] = value
+                added += 1
+            elif isinstance(current, dict_types):
+                # dicts are updated, never replaced
+                if isinstance(value, dict_types) and value is not current:
+                    stack.append((current, value, prefix + (key,) if key_paths else None))
+                continue
+            elif value is current:
+                continue
+            else:
+                template[key] = value
+                overwritten += 1
+            if key_paths:
+                paths.append(prefix + (key,))
+        if delete_notinsubset:
+            for key in [key for key in template if key not in subset]:
+                del template[key]
+                deleted += 1
+                if key_paths:
+                    paths.append(prefix + (key,))
+    return MergeStats(added, overwritten, deleted, paths)
 
 
 def delete_keys_recursive(superset, subset):
@@ -176,45 +659,107 @@ def delete_keys_recursive(superset, subset):
         will be changed in-place!
     subset : mappable
         subset of superset
+
+    Returns
+    -------
+    int
+        number of deleted keys
     """
-    for key in list(superset):
-        if key not in subset:
-            del superset[key]
-        elif isinstance(superset[key], _dict_types):
-            delete_keys_recursive(superset[key], subset[key])
-        else:
-            continue
+    deleted = 0
+    stack = [(superset, subset)]
+    while stack:
+        superset, subset = stack.pop()
+        for key in list(superset):
+            if key not in subset:
+                del superset[key]
+                deleted += 1
+            elif isinstance(superset[key], _dict_types) and isinstance(subset[key], _dict_types):
+                stack.append((superset[key], subset[key]))
+    return deleted
 
 
 def update_recursive_plain(template, other):
     """Wrapper for update_recursive without magic"""
-    update_recursive(
+    return update_recursive(
         template, other,
         ignore_notintemplate=False, delete_notinsubset=False)
 
 
 def save_to_yaml(
         configdict, yamlfile, round_trip=True,
-        default_flow_style=True, **kwargs):
+        default_flow_style=True, backend='auto', stream=False, **kwargs):
     """Save configdict to yaml
 
+    Paths are made relative to `rootdir` in the saved file
+    (see remove_rootdir_from_paths), configdict is not modified.
+    The file is replaced atomically: it is written to a temporary
+    file in the same directory first, which is then renamed.
+
     Parameters
     ----------
-    configdict : dict, OrderedDict, or _ruamel_type
+    configdict : dict, OrderedDict, or CommentedMap
         configdict to save
-        if not already _ruamel_type, will be converted with defaults template
+        if not already CommentedMap, will be converted with defaults template
     yamlfile : str
         path to save configdict to
+    round_trip : bool
+        use round-trip dumper (preserves comments and spacing)
+    default_flow_style : bool
+        use flow style for collections
+    backend : str
+        'auto', 'c' or 'pure'
+        dumper for non-round-trip mode
+        'auto' uses the libyaml C dumper if available
+    stream : bool
+        emit dicts and lists item by item instead of building
+        the YAML node graph for the whole config first
+        (constant memory for very large lists, see yamlconfig.emit)
+        not available in round-trip mode
     **kwargs : additional keyword arguments
         passed to ruamel.yaml.round_trip_dump
     """
+    if stream and round_trip:
+        raise ValueError('stream cannot be combined with round_trip.')
     kwargs.update(default_flow_style=default_flow_style)
-    rootdir_logic.remove_rootdir_from_paths(configdict)
-    with open(yamlfile, 'w') as fout:
-        if round_trip:
-            ruamel.yaml.round_trip_dump(configdict, fout, **kwargs)
-        else:
-            ruamel.yaml.safe_dump(configdict, fout, **kwargs)
+    use_c = _use_c_backend(backend)
+    configdict = rootdir_logic.relative_paths_view(configdict)
+    yaml = _yaml()
+    if use_c:
+        dumper_cls = _c_backend_classes()[1]
+    else:
+        dumper_cls = yaml.SafeDumper
+
+    yamlfile = os.path.abspath(yamlfile)
+    tmppath = '{}.{}.tmp'.format(yamlfile, binascii.hexlify(os.urandom(4)).decode('ascii'))
+    try:
+        with open(tmppath, 'w') as fout:
+            if round_trip:
+                yaml.round_trip_dump(configdict, fout, **kwargs)
+            elif stream:
+                from yamlconfig.emit import dump_streaming
+                dump_streaming(configdict, fout, dumper_cls, **kwargs)
+            else:
+                yaml.dump(configdict, fout, Dumper=dumper_cls, **kwargs)
+        if os.path.exists(yamlfile):
+            # keep permissions of replaced file
+            import shutil
+            shutil.copymode(yamlfile, tmppath)
+        _replace(tmppath, yamlfile)
+    except BaseException:
+        if os.path.exists(tmppath):
+            os.remove(tmppath)
+        raise
+
+
+def _replace(src, dst):
+    """Rename src to dst, replacing dst atomically if it exists"""
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        # Python 2
+        if os.name == 'nt' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
 
 
 def ordered_to_unordered(d):
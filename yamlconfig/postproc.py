@@ -5,7 +5,28 @@ class RequiredKeysError(Exception):
 
 
 def check_required_keys(configdict, required_keys=None):
+    """Check that config dict has required keys
+
+    Parameters
+    ----------
+    configdict : dict-like
+        config dict
+    required_keys : list of str or Schema or dict, optional
+        top-level keys or nested schema (see yamlconfig.schema)
+        a schema also sets defaults and joins path fields
+
+    Raises
+    ------
+    RequiredKeysError
+        SchemaError listing all errors for a schema
+    """
     if required_keys is None:
         return
+    if isinstance(required_keys, dict):
+        from yamlconfig.schema import Schema
+        required_keys = Schema(required_keys)
+    if hasattr(required_keys, 'validate'):
+        required_keys.validate(configdict)
+        return
     if not set(configdict).issuperset(set(required_keys)):
         raise RequiredKeysError('Config keys set does not include required: {}'.format(required_keys))
@@ -3,12 +3,12 @@ import re
 import logging
 from collections import OrderedDict
 
-import ruamel.yaml
+from yamlconfig.merge import new_like
 
 logger = logging.getLogger(__name__)
 
-_ruamel_type = ruamel.yaml.comments.CommentedMap
-_dict_types = (dict, OrderedDict, _ruamel_type)
+# ruamel.yaml CommentedMap is an OrderedDict subclass
+_dict_types = (dict, OrderedDict)
 
 default_key_regex = [
         '.*_(file|dir)($|_.*)',
@@ -23,21 +23,85 @@ def set_rootdir(configdict, config_file):
         configdict['rootdir'] = os.path.dirname(config_file)
 
 
+class PathKeyMatcher(object):
+
+    max_memo = 65536
+
+    def __init__(self, regex=default_key_regex, exclude=None):
+        """Decide which config keys hold paths
+
+        The regex patterns are compiled once into a single
+        alternation and decisions are memoized per key.
+
+        Parameters
+        ----------
+        regex : list of str
+            regex to match
+        exclude : list of str
+            exclude these keys
+            `rootdir` is always excluded
+        """
+        self.regex = list(regex or [])
+        self.exclude = frozenset(exclude or []) | frozenset(['rootdir'])
+        if self.regex:
+            self._pattern = re.compile('|'.join('(?:{})'.format(rr) for rr in self.regex))
+        else:
+            self._pattern = None
+        self._memo = {}
+
+    def __call__(self, key):
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable key
+            return self._match(key)
+        matches = self._match(key)
+        if len(self._memo) < self.max_memo:
+            self._memo[key] = matches
+        return matches
+
+    def _match(self, key):
+        if self._pattern is None or key in self.exclude:
+            return False
+        try:
+            matches = self._pattern.match(key) is not None
+        except TypeError:
+            # not a string
+            return False
+        if matches:
+            logger.debug('Key \'%s\' matches path regex.', key)
+        return matches
+
+    def __repr__(self):
+        return '{}(regex={!r}, exclude={!r})'.format(
+                self.__class__.__name__, self.regex, sorted(self.exclude))
+
+
+_matchers = {}
+
+
+def get_matcher(regex=default_key_regex, exclude=None):
+    """Get shared PathKeyMatcher for regex and exclude"""
+    key = (tuple(regex or []), frozenset(exclude or []))
+    try:
+        return _matchers[key]
+    except KeyError:
+        matcher = _matchers[key] = PathKeyMatcher(regex, exclude)
+        return matcher
+
+
 def _key_matches(key, regex, exclude):
-    if key in exclude:
-        return False
-    for rr in regex:
-        if re.match(rr, key) is not None:
-            logger.debug('Regex \'%s\' matches key \'%s\'.', rr, key)
-            return True
-    return False
+    return get_matcher(regex, exclude)(key)
 
 
 def join_paths_with_rootdir(
         configdict,
         default_rootdir=None,
         regex=default_key_regex,
-        exclude=None):
+        exclude=None,
+        matcher=None):
     """Join all relative paths in configdict with rootdir
 
     Parameters
@@ -51,14 +115,11 @@ def join_paths_with_rootdir(
         regex to match
     exclude : list of str
         exclude these keys
+    matcher : PathKeyMatcher, optional
+        use this matcher instead of regex and exclude
     """
-    if exclude is None:
-        exclude = ['rootdir']
-    else:
-        exclude.append('rootdir')
-
-    if regex is None:
-        regex = []
+    if matcher is None:
+        matcher = get_matcher(regex, exclude)
 
     rootdir = configdict.get('rootdir', default_rootdir)
     logger.debug('Rootdir is \'%s\'.', rootdir)
@@ -71,22 +132,24 @@ def join_paths_with_rootdir(
             configdict[key] = join_paths_with_rootdir(
                     configdict[key],
                     default_rootdir=default_rootdir,
-                    exclude=exclude)
-        elif _key_matches(key, regex, exclude):
-            val = configdict[key]
-    
-            if isinstance(val, str):
-                configdict[key] = _join_maybe(rootdir, val)
-                continue
+                    matcher=matcher)
+        elif matcher(key):
+            configdict[key] = join_value(rootdir, configdict[key])
 
-            try:
-                iter(val)
-            except TypeError:
-                continue
+    return configdict
 
-            configdict[key] = [_join_maybe(rootdir, f) for f in val]
 
-    return configdict
+def join_value(rootdir, val):
+    """Join path or iterable of paths with rootdir"""
+    if isinstance(val, str):
+        return _join_maybe(rootdir, val)
+
+    try:
+        iter(val)
+    except TypeError:
+        return val
+
+    return [_join_maybe(rootdir, f) for f in val]
 
 
 def _join_maybe(root, path):
@@ -96,27 +159,85 @@ def _join_maybe(root, path):
         return path
 
 
-def remove_rootdir_from_paths(configdict, regex=default_key_regex, exclude=None):
-    """Reverse join_paths_with_rootdir"""
+def remove_rootdir_from_paths(
+        configdict, regex=default_key_regex, exclude=None, matcher=None):
+    """Reverse join_paths_with_rootdir (in-place)"""
     try:
         rootdir = os.path.abspath(configdict['rootdir'])
     except KeyError:
         return
     if not rootdir:
         return
-    if exclude is None:
-        exclude = ['rootdir']
-    else:
-        exclude.append('rootdir')
+    if matcher is None:
+        matcher = get_matcher(regex, exclude)
     for key in configdict:
         if isinstance(configdict[key], _dict_types):
-            remove_rootdir_from_paths(configdict[key])
-        elif _key_matches(key, regex, exclude) and configdict[key]:
-            try:
-                # this can fail if the paths are on different drives
-                # on Windows
-                relpath = os.path.relpath(configdict[key], rootdir)
-            except ValueError:
-                continue
-            if not relpath.startswith('.'):
+            remove_rootdir_from_paths(configdict[key], matcher=matcher)
+        elif matcher(key) and configdict[key]:
+            relpath = _relpath_maybe(configdict[key], rootdir)
+            if relpath is not None:
                 configdict[key] = relpath
+
+
+def relative_paths_view(
+        configdict, regex=default_key_regex, exclude=None, matcher=None):
+    """Reverse join_paths_with_rootdir without modifying configdict
+
+    Same as remove_rootdir_from_paths on a copy, but only the
+    mappings that contain changed paths (and their parents) are copied,
+    all other values are shared with configdict.
+
+    Parameters
+    ----------
+    configdict : dict
+        config dictionary
+    regex : list of str
+        regex to match
+    exclude : list of str
+        exclude these keys
+    matcher : PathKeyMatcher, optional
+        use this matcher instead of regex and exclude
+
+    Returns
+    -------
+    dict
+        configdict itself if no path changes
+    """
+    try:
+        rootdir = os.path.abspath(configdict['rootdir'])
+    except KeyError:
+        return configdict
+    if not rootdir:
+        return configdict
+    if matcher is None:
+        matcher = get_matcher(regex, exclude)
+    changed = {}
+    for key in configdict:
+        value = configdict[key]
+        if isinstance(value, _dict_types):
+            new = relative_paths_view(value, matcher=matcher)
+            if new is not value:
+                changed[key] = new
+        elif matcher(key) and value:
+            relpath = _relpath_maybe(value, rootdir)
+            if relpath is not None:
+                changed[key] = relpath
+    if not changed:
+        return configdict
+    view = new_like(configdict)
+    for key in configdict:
+        view[key] = changed.get(key, configdict[key])
+    return view
+
+
+def _relpath_maybe(path, rootdir):
+    """Path relative to rootdir or None if outside rootdir"""
+    try:
+        # this can fail if the paths are on different drives
+        # on Windows
+        relpath = os.path.relpath(path, rootdir)
+    except ValueError:
+        return None
+    if relpath.startswith('.'):
+        return None
+    return relpath
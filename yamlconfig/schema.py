@@ -0,0 +1,177 @@
+import copy
+
+from yamlconfig.parse import _dict_types
+from yamlconfig.rootdir_logic import join_value
+from yamlconfig.postproc import RequiredKeysError
+
+_MISSING = object()
+
+
+class SchemaError(RequiredKeysError, ValueError):
+
+    def __init__(self, errors):
+        """Config does not match schema
+
+        Parameters
+        ----------
+        errors : list of str
+            all errors found
+        """
+        self.errors = errors
+        super(SchemaError, self).__init__(
+            'Config does not match schema:\n' + '\n'.join('  ' + e for e in errors))
+
+
+class Field(object):
+
+    def __init__(self, type=None, required=True, default=_MISSING, path=False, schema=None):
+        """Schema field
+
+        Parameters
+        ----------
+        type : type or tuple of types, optional
+            allowed value types
+        required : bool
+            key must be present
+            fields with default are never required
+        default : optional
+            value to set if key is missing
+            each config gets its own copy
+        path : bool
+            value is a path (or list of paths)
+            relative paths are joined with rootdir
+        schema : dict, optional
+            nested schema for mapping values
+        """
+        self.type = type
+        self.default = default
+        self.required = required and default is _MISSING
+        self.path = path
+        self.schema = schema
+
+
+def _type_name(types):
+    if isinstance(types, tuple):
+        return ' or '.join(t.__name__ for t in types)
+    return types.__name__
+
+
+def _compile_field(key, field):
+    """Compile field into check(configdict, prefix, rootdir, errors)"""
+    types = field.type
+    if types is float:
+        types = (float, int)
+    reject_bool = types is not None and bool not in (types if isinstance(types, tuple) else (types,))
+    nested = _compile_mapping(field.schema) if field.schema is not None else None
+    required = field.required
+    default = field.default
+    path = field.path
+
+    def check(configdict, prefix, rootdir, errors):
+        try:
+            value = configdict[key]
+        except KeyError:
+            if required:
+                errors.append('{}: missing required key'.format(prefix + str(key)))
+            elif default is not _MISSING:
+                configdict[key] = copy.deepcopy(default)
+            return
+        if types is not None and (
+                not isinstance(value, types) or (reject_bool and isinstance(value, bool))):
+            errors.append('{}: expected {}, got {}'.format(
+                prefix + str(key), _type_name(types), type(value).__name__))
+            return
+        if nested is not None:
+            if not isinstance(value, _dict_types):
+                errors.append('{}: expected mapping, got {}'.format(
+                    prefix + str(key), type(value).__name__))
+                return
+            nested(value, prefix + str(key) + '.', value.get('rootdir', rootdir), errors)
+        if path and rootdir is not None:
+            configdict[key] = join_value(rootdir, value)
+
+    return check
+
+
+def _as_field(spec):
+    if isinstance(spec, Field):
+        return spec
+    if isinstance(spec, _dict_types):
+        return Field(schema=spec)
+    if spec is None:
+        return Field()
+    return Field(type=spec)
+
+
+def _compile_mapping(spec):
+    checks = [_compile_field(key, _as_field(field)) for key, field in spec.items()]
+
+    def check_mapping(configdict, prefix, rootdir, errors):
+        for check in checks:
+            check(configdict, prefix, rootdir, errors)
+
+    return check_mapping
+
+
+class Schema(object):
+
+    def __init__(self, spec):
+        """Nested config schema, compiled once
+
+        Parameters
+        ----------
+        spec : dict
+            key -> Field, type, nested spec dict or None
+            a type means a required key of that type,
+            a dict a required nested mapping,
+            None a required key of any type
+
+        Example
+        -------
+        >>> schema = Schema({
+        ...     'name': str,
+        ...     'processing': {
+        ...         'scale': Field(float, default=1.0),
+        ...         'output_dir': Field(str, path=True)}})
+        """
+        self.spec = spec
+        self._check = _compile_mapping(spec)
+
+    @property
+    def keys(self):
+        """Top-level keys"""
+        return list(self.spec)
+
+    def validate(self, configdict, rootdir=None):
+        """Validate config dict, set defaults and join paths IN-PLACE
+
+        Parameters
+        ----------
+        configdict : dict-like
+            config dict
+        rootdir : str, optional
+            rootdir for path fields
+            overrides `rootdir` in configdict, which is used if not given
+            (no joining if neither is set)
+            nested mappings with their own `rootdir` use that
+
+        Returns
+        -------
+        dict-like
+            configdict
+
+        Raises
+        ------
+        SchemaError
+            listing all errors
+        """
+        errors = []
+        if not isinstance(configdict, _dict_types):
+            errors.append('config must be a mapping, got {}'.format(type(configdict).__name__))
+        else:
+            if rootdir is None:
+                rootdir = configdict.get('rootdir')
+            self._check(configdict, '', rootdir, errors)
+        if errors:
+            raise SchemaError(errors)
+        return configdict
@@ -0,0 +1,161 @@
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+
+import yamlconfig
+from yamlconfig.cache import file_stamp
+from yamlconfig.cache import options_key
+from yamlconfig.parse import _replace
+from yamlconfig.source import as_source
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = '.yamlconfig.pickle'
+
+
+def _content_hash(path):
+    """SHA-1 of file content or None if file is missing"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, 'rb') as fin:
+            for chunk in iter(lambda: fin.read(1 << 20), b''):
+                digest.update(chunk)
+    except (IOError, OSError):
+        return None
+    return digest.hexdigest()
+
+
+def read_hashed(path):
+    """Read file content and its SHA-1
+
+    Parse the returned bytes, so the recorded hash
+    is that of the content that was actually parsed.
+
+    Returns
+    -------
+    bytes
+        file content
+    str
+        SHA-1 hex digest
+    """
+    with open(path, 'rb') as fin:
+        data = fin.read()
+    return data, hashlib.sha1(data).hexdigest()
+
+
+def sidecar_path(sidecar_dir, configfile, **options):
+    """Get path of sidecar file for config file and parse options
+
+    Parameters
+    ----------
+    sidecar_dir : str
+        cache directory
+    configfile : str or FileSource
+        path to YAML config file
+    **options : parse options
+        including basedir
+
+    Returns
+    -------
+    str
+        path to sidecar file
+    """
+    key = '\n'.join([
+        yamlconfig.__version__,
+        as_source(configfile).key,
+        options_key(**options)])
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest() + SIDECAR_SUFFIX
+    return os.path.join(sidecar_dir, name)
+
+
+def load_sidecar(path):
+    """Load config dict from sidecar file
+
+    Only use sidecar directories you trust: sidecars are pickles.
+
+    Parameters
+    ----------
+    path : str
+        path to sidecar file
+
+    Returns
+    -------
+    tuple or None
+        (config dict, list of parsed files, list of file stamps)
+        the stamps are taken before each file is checked
+        None if sidecar is missing, unreadable,
+        written by another version or any of the files changed
+    """
+    try:
+        with open(path, 'rb') as fin:
+            sidecar = pickle.load(fin)
+    except (IOError, OSError):
+        return None
+    except Exception as exc:
+        logger.warning('Ignoring unreadable sidecar \'%s\' (%s).', path, exc)
+        return None
+    try:
+        if sidecar['version'] != yamlconfig.__version__:
+            return None
+        stamps = []
+        for fpath, digest in sidecar['files']:
+            stamps.append(file_stamp(fpath))
+            if _content_hash(fpath) != digest:
+                logger.debug('Sidecar \'%s\' is stale: \'%s\' changed.', path, fpath)
+                return None
+        return sidecar['configdict'], [fpath for fpath, _ in sidecar['files']], stamps
+    except (KeyError, TypeError, ValueError):
+        logger.warning('Ignoring invalid sidecar \'%s\'.', path)
+        return None
+
+
+def write_sidecar(path, configdict, files, digests):
+    """Write sidecar file atomically
+
+    Parameters
+    ----------
+    path : str
+        path to sidecar file
+    configdict : dict-like
+        parsed config dict
+    files : list of str
+        config file and all linked config files
+    digests : list of str
+        SHA-1 of the content parsed from each file
+        (see read_hashed), never hashes taken after parsing
+
+    Returns
+    -------
+    bool
+        whether sidecar was written
+    """
+    sidecar = dict(
+            version=yamlconfig.__version__,
+            files=list(zip(files, digests)),
+            configdict=configdict)
+    sidecar_dir = os.path.dirname(path)
+    tmppath = None
+    try:
+        _makedirs(sidecar_dir)
+        fd, tmppath = tempfile.mkstemp(dir=sidecar_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fout:
+            pickle.dump(sidecar, fout, protocol=pickle.HIGHEST_PROTOCOL)
+        _replace(tmppath, path)
+    except Exception as exc:
+        logger.warning('Unable to write sidecar \'%s\' (%s).', path, exc)
+        if tmppath is not None and os.path.exists(tmppath):
+            os.remove(tmppath)
+        return False
+    return True
+
+
+def _makedirs(path):
+    try:
+        os.makedirs(path)
+    except OSError:
+        # other process may have created it
+        if not os.path.isdir(path):
+            raise
+
@@ -0,0 +1,191 @@
+import os
+import copy
+import mmap
+import contextlib
+
+try:
+    # unicode paths on Python 2
+    _text_types = (str, unicode)
+except NameError:
+    _text_types = (str,)
+
+
+class ConfigSource(object):
+    """Where a YAML config is read from
+
+    Attributes
+    ----------
+    name : str
+        name used in messages and traces
+    basedir : str or None
+        directory that `rootdir` defaults to
+        and relative `config_files` are resolved against
+    key : hashable
+        identity of the source in include graphs
+    """
+
+    is_file = False
+
+    def __init__(self, name, basedir=None):
+        self.name = name
+        self.basedir = basedir
+
+    @property
+    def key(self):
+        raise NotImplementedError
+
+    def open(self):
+        """Context manager yielding a stream ruamel.yaml can load
+
+        (text or binary file object, str, bytes or mmap)
+        """
+        raise NotImplementedError
+
+    def resolve_linked(self, path):
+        """Source of linked config file at path
+
+        Parameters
+        ----------
+        path : str
+            entry of `config_files`, joined with rootdir
+
+        Returns
+        -------
+        str or ConfigSource
+            default is the path itself (a file)
+        """
+        return path
+
+    def __repr__(self):
+        return '{}({!r}, basedir={!r})'.format(self.__class__.__name__, self.name, self.basedir)
+
+    def __str__(self):
+        return self.name
+
+
+class FileSource(ConfigSource):
+
+    is_file = True
+
+    def __init__(self, path, basedir=None):
+        """Config file on the file system
+
+        Parameters
+        ----------
+        path : str
+            path to YAML file
+        basedir : str, optional
+            default is the file's directory
+        """
+        if basedir is None:
+            basedir = os.path.dirname(path)
+        super(FileSource, self).__init__(path, basedir=basedir)
+        self.path = path
+
+    @property
+    def key(self):
+        return os.path.normcase(os.path.abspath(self.path))
+
+    def open(self):
+        return open(self.path, 'r')
+
+
+class BufferSource(ConfigSource):
+
+    def __init__(self, data, basedir=None, name=None):
+        """Config held in memory
+
+        The data is handed to the YAML reader as is, without copying.
+
+        Parameters
+        ----------
+        data : bytes, str or mmap.mmap
+            YAML document
+            bytes are decoded as UTF-8/16 (BOM detected)
+            an mmap is read from the start
+        basedir : str, optional
+            base directory for rootdir and linked files
+            default: relative linked files are resolved
+            against the current working directory
+        name : str, optional
+            name used in messages
+        """
+        if name is None:
+            name = '<{}>'.format(type(data).__name__)
+        super(BufferSource, self).__init__(name, basedir=basedir)
+        self.data = data
+
+    @property
+    def key(self):
+        return ('buffer', id(self.data))
+
+    @contextlib.contextmanager
+    def open(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.seek(0)
+        yield self.data
+
+
+class StreamSource(ConfigSource):
+
+    def __init__(self, stream, basedir=None, name=None):
+        """Config read from a text or binary file-like object
+
+        Streams can only be read once.
+
+        Parameters
+        ----------
+        stream : file-like
+            object with a `read` method
+        basedir : str, optional
+            base directory for rootdir and linked files
+        name : str, optional
+            name used in messages
+            default is the stream's name attribute
+        """
+        if name is None:
+            name = getattr(stream, 'name', None)
+            if not isinstance(name, _text_types):
+                name = '<stream>'
+        super(StreamSource, self).__init__(name, basedir=basedir)
+        self.stream = stream
+
+    @property
+    def key(self):
+        return ('stream', id(self.stream))
+
+    @contextlib.contextmanager
+    def open(self):
+        yield self.stream
+
+
+def as_source(configfile, basedir=None):
+    """Get ConfigSource for path, bytes, mmap or file-like
+
+    Parameters
+    ----------
+    configfile : str, ConfigSource, bytes, mmap.mmap or file-like
+        a str is always a path, wrap YAML text in BufferSource
+    basedir : str, optional
+        base directory for rootdir and linked files
+        overrides the basedir of a ConfigSource
+
+    Returns
+    -------
+    ConfigSource
+    """
+    if isinstance(configfile, ConfigSource):
+        if basedir is None or basedir == configfile.basedir:
+            return configfile
+        source = copy.copy(configfile)
+        source.basedir = basedir
+        return source
+    if isinstance(configfile, _text_types):
+        return FileSource(configfile, basedir=basedir)
+    if isinstance(configfile, (bytes, mmap.mmap)):
+        return BufferSource(configfile, basedir=basedir)
+    if hasattr(configfile, 'read'):
+        return StreamSource(configfile, basedir=basedir)
+    raise TypeError(
+            'Expected path, bytes, mmap or file-like object, got {}.'.format(
+                type(configfile).__name__))
@@ -0,0 +1,76 @@
+import time
+import threading
+from collections import namedtuple
+from collections import OrderedDict
+
+clock = getattr(time, 'perf_counter', time.time)
+
+PhaseRecord = namedtuple('PhaseRecord', ['phase', 'path', 'duration', 'nbytes', 'depth'])
+
+# tracer collecting records, None if tracing is disabled
+# instrumented code only checks this before doing any work
+active_tracer = None
+
+
+class Tracer(object):
+
+    def __init__(self, callback=None):
+        """Collect per-file and per-phase timings
+
+        Use as context manager to enable tracing in parse_config_file,
+        parse_merge_multiple and the click YAMLConfig type:
+
+            with Tracer() as tracer:
+                parse_config_file(path)
+            print(tracer.summary())
+
+        Phases are `read` (with bytes read), `parse` (YAML parsing),
+        `join_rootdir`, `load` (read, parse and join of one file in
+        the include tree, with its depth), `merge`, `copy`, `cache`,
+        `sidecar` and `convert` (click). Files parsed on a process
+        pool are not traced.
+
+        Parameters
+        ----------
+        callback : callable, optional
+            called with each PhaseRecord as it is recorded
+        """
+        self.callback = callback
+        self.records = []
+        self._lock = threading.Lock()
+        self._previous = []
+
+    def record(self, phase, path, start, nbytes=None, depth=None):
+        """Record phase that started at `start` (clock time)"""
+        rec = PhaseRecord(phase, path, clock() - start, nbytes, depth)
+        with self._lock:
+            self.records.append(rec)
+        if self.callback is not None:
+            self.callback(rec)
+        return rec
+
+    def summary(self):
+        """Total duration and bytes per phase
+
+        Returns
+        -------
+        OrderedDict
+            phase -> dict(count, duration, nbytes)
+        """
+        totals = OrderedDict()
+        for rec in self.records:
+            total = totals.setdefault(rec.phase, dict(count=0, duration=0.0, nbytes=0))
+            total['count'] += 1
+            total['duration'] += rec.duration
+            total['nbytes'] += rec.nbytes or 0
+        return totals
+
+    def __enter__(self):
+        global active_tracer
+        self._previous.append(active_tracer)
+        active_tracer = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global active_tracer
+        active_tracer = self._previous.pop()
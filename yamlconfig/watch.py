@@ -0,0 +1,189 @@
+import logging
+import threading
+
+from yamlconfig.cache import file_stamp
+from yamlconfig.diff import diff_configs
+from yamlconfig.parse import _file_key
+from yamlconfig.parse import _dict_types
+from yamlconfig.parse import _load_layer
+from yamlconfig.parse import _merge_linked
+from yamlconfig.parse import _build_include_graph
+
+logger = logging.getLogger(__name__)
+
+
+def changed_key_paths(old, new):
+    """Key paths whose values differ between two config dicts
+
+    Subtrees that are the same object are skipped.
+
+    Returns
+    -------
+    list of tuple
+        key paths (tuples of keys)
+    """
+    if not isinstance(old, _dict_types) or not isinstance(new, _dict_types):
+        return [] if old is new or old == new else [()]
+    diff = diff_configs(old, new)
+    return diff.added + diff.changed + diff.removed
+
+
+class ConfigWatcher(object):
+
+    def __init__(
+            self, configfile, join_rootdir=False,
+            merge_linked_files=True, round_trip=False,
+            rootdir_kwargs={}):
+        """Keep config dict up to date with its files
+
+        Tracks the config file and all linked config files by
+        modification time and size. On change, only the changed files
+        are parsed again and only the config dicts that include them
+        are merged again.
+
+        The config dict shares subtrees with the parsed files
+        and must be treated as read-only.
+
+        Parameters
+        ----------
+        configfile : str
+            path to YAML config file
+        join_rootdir, merge_linked_files, round_trip, rootdir_kwargs
+            see parse_config_file
+        """
+        self.configfile = configfile
+        self.merge_linked_files = merge_linked_files
+        self._load_kwargs = dict(
+                join_rootdir=join_rootdir,
+                round_trip=round_trip,
+                rootdir_kwargs=rootdir_kwargs)
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stop = threading.Event()
+        # file key -> (stamp, configdict, linked paths)
+        self._layers = {}
+        # file key -> (children, resolved config dict)
+        self._resolved = {}
+        self.config = None
+        self._update()
+
+    @property
+    def files(self):
+        """Paths of config file and all linked files"""
+        return [path for path, _ in self._stamps()]
+
+    def _stamps(self):
+        return [(self._paths[key], self._layers[key][0]) for key in self._order]
+
+    def subscribe(self, callback):
+        """Call callback(config, changed_key_paths) on every change"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def _update(self):
+        """Reload changed files and re-merge affected config dicts
+
+        Returns
+        -------
+        list of str
+            paths of files that were parsed again
+        """
+        reloaded = []
+        reloaded_keys = set()
+        layers = {}
+
+        def load_layer(path):
+            key = _file_key(path)
+            stamp = file_stamp(path)
+            try:
+                cached_stamp, configdict, linked = self._layers[key]
+            except KeyError:
+                pass
+            else:
+                if cached_stamp == stamp:
+                    layers[key] = self._layers[key]
+                    return configdict, linked
+            configdict, linked = _load_layer(path, **self._load_kwargs)
+            reloaded.append(path)
+            reloaded_keys.add(key)
+            layers[key] = (stamp, configdict, linked)
+            return configdict, linked
+
+        nodes, order = _build_include_graph(
+                self.configfile, load_layer, merge_linked_files=self.merge_linked_files)
+
+        resolved = {}
+        dirty = set()
+        for key in order:
+            _, configdict, children = nodes[key]
+            previous = self._resolved.get(key)
+            if (key in reloaded_keys or previous is None or previous[0] != children or
+                    any(child in dirty for child in children)):
+                merged = _merge_linked(configdict, [resolved[child][1] for child in children])
+                resolved[key] = (children, merged)
+                dirty.add(key)
+            else:
+                resolved[key] = previous
+
+        self._layers = layers
+        self._resolved = resolved
+        self._order = order
+        self._paths = dict((key, nodes[key][0]) for key in order)
+        self.config = resolved[order[-1]][1]
+        return reloaded
+
+    def poll(self):
+        """Check files for changes and update config
+
+        Subscribers are notified if the config changed.
+
+        Returns
+        -------
+        list of tuple
+            changed key paths
+        """
+        with self._lock:
+            if all(file_stamp(path) == stamp for path, stamp in self._stamps()):
+                return []
+            old_config = self.config
+            try:
+                reloaded = self._update()
+            except Exception as exc:
+                # e.g. file is being written, try again on next poll
+                logger.warning('Unable to reload \'%s\' (%s).', self.configfile, exc)
+                return []
+            logger.debug('Reloaded %s.', reloaded)
+            changed = changed_key_paths(old_config, self.config)
+            config = self.config
+        if changed:
+            for callback in list(self._subscribers):
+                callback(config, changed)
+        return changed
+
+    def start(self, interval=1.0):
+        """Poll for changes every `interval` seconds in background thread"""
+        if self._thread is not None:
+            raise RuntimeError('Watcher is already running.')
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.poll()
+                except Exception:
+                    logger.exception('Error while polling \'%s\'.', self.configfile)
+
+        self._thread = threading.Thread(target=run, name='ConfigWatcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop background polling"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None